@@ -12,13 +12,13 @@ from flask import Flask, session, redirect, url_for, flash, request, jsonify
 
 from flask_babel import Babel, get_locale
 
-from .views.email import email_tasks, email_tasks_lock, scraping_accounts
 from .models.database import Database
 from .config.base import Config
 from .extensions import db, migrate, limiter, csrf
 from .utils.safe_session_interface import SafeCookieSessionInterface
 from flask_wtf.csrf import CSRFError, generate_csrf
 from .utils.template_filters import format_currency_rtl, format_account_number_rtl
+from .utils.json_provider import init_json_provider
 
 # Optional Redis session support
 try:
@@ -33,6 +33,10 @@ def create_app(config_class=Config):
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    init_json_provider(app)
+    # Key order carries no meaning for API clients; skip sorting every payload.
+    # Responses are already compact unless app.debug is on.
+    app.json.sort_keys = False
     app.jinja_env.filters['format_currency_rtl'] = format_currency_rtl
     app.jinja_env.filters['account_number_rtl'] = format_account_number_rtl
 
@@ -351,7 +355,18 @@ def _configure_csrf_exemptions(app):
 
 def _configure_logging(app):
     """Configure application logging."""
-    if not app.debug and not app.testing:
+    if app.testing:
+        # No output during tests: a NullHandler keeps logging's last-resort stderr
+        # handler quiet, while records still reach pytest's log capture
+        package_logger = logging.getLogger(__name__)
+        if not any(
+            isinstance(handler, logging.NullHandler)
+            for handler in package_logger.handlers
+        ):
+            package_logger.addHandler(logging.NullHandler())
+        return
+
+    if not app.debug:
         try:
             import sys
 
@@ -593,6 +608,10 @@ def _register_request_handlers(app):
 
 def _cleanup_email_tasks():
     """Clean up old email tasks and scraping accounts."""
+    # Imported here rather than at module level so importing the app package
+    # (models, config, CLI tooling) does not pull in the email/Gmail stack
+    from .views.email import email_tasks, email_tasks_lock, scraping_accounts
+
     try:
         current_time = time.time()
         tasks_to_remove = []
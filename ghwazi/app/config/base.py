@@ -23,6 +23,8 @@ class Config:
     "postgres://", "postgresql://"
 )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Raise on unplanned lazy loads in the account views instead of querying
+    SQLA_STRICT_LOADING = False
 
     # Email settings
     EMAIL_HOST = os.environ.get("EMAIL_HOST", "imap.gmail.com")
@@ -63,6 +63,9 @@ class DevelopmentConfig(Config):
     GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
     GOOGLE_REDIRECT_URI = "http://localhost:5000/oauth/google/callback"
 
+    # Surface accidental lazy loads while developing
+    SQLA_STRICT_LOADING = True
+
     # Development logging
     LOG_LEVEL = "DEBUG"
 
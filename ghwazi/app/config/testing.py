@@ -17,6 +17,9 @@ class TestingConfig(Config):
     # Use in-memory SQLite database for testing
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
+    # Fail tests on accidental lazy loads
+    SQLA_STRICT_LOADING = True
+
     # Disable CSRF for testing
     WTF_CSRF_ENABLED = False
 
@@ -36,8 +39,3 @@ class TestingConfig(Config):
     def init_app(app):
         """Initialize testing-specific settings."""
         Config.init_app(app)
-
-        # Suppress logging during tests
-        import logging
-
-        logging.disable(logging.CRITICAL)
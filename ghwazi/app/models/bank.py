@@ -0,0 +1,58 @@
+"""
+Bank lookup helpers for the Bank Email Parser & Account Tracker.
+"""
+
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .models import Bank
+
+# The bank table is seeded at startup and practically never changes, so the
+# account forms share one in-process copy of it. Writers call
+# invalidate_bank_cache(); the TTL bounds staleness across worker processes.
+BANK_CACHE_TTL = 300.0
+_bank_cache: Optional[Tuple[float, List["BankOption"]]] = None
+_bank_cache_lock = threading.Lock()
+
+
+class BankOption(NamedTuple):
+    """Session-independent snapshot of the Bank columns used by the account forms."""
+
+    id: int
+    name: str
+    currency: str
+
+
+def invalidate_bank_cache() -> None:
+    """Drop the cached bank list after the banks table is modified."""
+    global _bank_cache
+    with _bank_cache_lock:
+        _bank_cache = None
+
+
+class BankRepository:
+    """Repository for bank lookups."""
+
+    @staticmethod
+    def get_bank_options(session: Session) -> List[BankOption]:
+        """Return all banks, served from the process-wide cache while it is fresh."""
+        global _bank_cache
+        with _bank_cache_lock:
+            if (
+                _bank_cache is not None
+                and time.monotonic() - _bank_cache[0] <= BANK_CACHE_TTL
+            ):
+                return _bank_cache[1]
+
+        banks = [
+            BankOption(bank_id, name, currency)
+            for bank_id, name, currency in session.query(
+                Bank.id, Bank.name, Bank.currency
+            ).order_by(Bank.id)
+        ]
+        with _bank_cache_lock:
+            _bank_cache = (time.monotonic(), banks)
+        return banks
@@ -1,7 +1,9 @@
 import logging
 import random
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from .models import (Account, Category, CategoryMapping, CategoryType,
@@ -13,6 +15,10 @@ except ImportError:
     from ghwazi.app.services.default_categories import suggest_category, normalize_text
 logger = logging.getLogger(__name__)
 
+# Maximum number of ids bound into a single "id IN (...)" UPDATE. Keeps statements
+# small enough to plan cheaply and under SQLite's host-parameter limit.
+UPDATE_BATCH_SIZE = 500
+
 
 class CategoryRepository:
     """Repository class for category operations."""
@@ -250,20 +256,10 @@ class CategoryRepository:
                 )
                 return False
 
-            # Remove category from transactions
-            # First, get transaction IDs to update
-            transaction_ids = [
-                row.id
-                for row in session.query(Transaction.id)
-                .filter(Transaction.category_id == category_id)
-                .all()
-            ]
-
-            # Then update using a simple query
-            if transaction_ids:
-                session.query(Transaction).filter(
-                    Transaction.id.in_(transaction_ids)
-                ).update({Transaction.category_id: None}, synchronize_session=False)
+            # Remove category from transactions in a single UPDATE
+            session.query(Transaction).filter(
+                Transaction.category_id == category_id
+            ).update({Transaction.category_id: None}, synchronize_session=False)
 
             session.delete(category)
             session.commit()
@@ -356,50 +352,24 @@ class CategoryRepository:
                 f"Created category mapping: {mapping.id} for category {category_id}"
             )
 
-            # Update transactions that match this pattern
+            # Update the user's transactions that match this pattern in a single
+            # UPDATE, without fetching their ids first
             if mapping_type == CategoryType.COUNTERPARTY:
-                # Get transaction IDs that need to be updated
-                transaction_ids = [
-                    t.id
-                    for t in session.query(Transaction.id)
-                    .join(Account, Transaction.account)
-                    .join(Counterparty, Transaction.counterparty)
-                    .filter(
-                        Account.user_id == user_id,
-                        Counterparty.name == pattern,
-                    )
-                    .all()
-                ]
-
-                # Update transactions without using join
-                if transaction_ids:
-                    session.query(Transaction).filter(
-                        Transaction.id.in_(transaction_ids)
-                    ).update(
-                        {Transaction.category_id: category_id},
-                        synchronize_session=False,
-                    )
+                match_condition = Transaction.counterparty_id.in_(
+                    select(Counterparty.id).where(Counterparty.name == pattern)
+                )
             else:  # DESCRIPTION
-                # Get transaction IDs that need to be updated
-                transaction_ids = [
-                    t.id
-                    for t in session.query(Transaction.id)
-                    .join(Account)
-                    .filter(
-                        Account.user_id == user_id,
-                        Transaction.transaction_details == pattern,
-                    )
-                    .all()
-                ]
-
-                # Update transactions without using join
-                if transaction_ids:
-                    session.query(Transaction).filter(
-                        Transaction.id.in_(transaction_ids)
-                    ).update(
-                        {Transaction.category_id: category_id},
-                        synchronize_session=False,
-                    )
+                match_condition = Transaction.transaction_details == pattern
+
+            session.query(Transaction).filter(
+                Transaction.account_id.in_(
+                    select(Account.id).where(Account.user_id == user_id)
+                ),
+                match_condition,
+            ).update(
+                {Transaction.category_id: category_id},
+                synchronize_session=False,
+            )
 
             session.commit()
             return mapping
@@ -599,12 +569,7 @@ class CategoryRepository:
                     )
 
                     # Check for word boundaries or exact match
-                    if (
-                        f" {pattern} " in f" {counterparty} "
-                        or counterparty.startswith(f"{pattern} ")
-                        or counterparty.endswith(f" {pattern}")
-                        or counterparty == pattern
-                    ):
+                    if _matches_pattern(pattern, counterparty):
                         transaction.category_id = mapping.category_id
                         session.commit()
                         logger.info(
@@ -636,12 +601,7 @@ class CategoryRepository:
                     description = normalize_text(transaction.transaction_details)
 
                     # Check for word boundaries or exact match
-                    if (
-                        f" {pattern} " in f" {description} "
-                        or description.startswith(f"{pattern} ")
-                        or description.endswith(f" {pattern}")
-                        or description == pattern
-                    ):
+                    if _matches_pattern(pattern, description):
                         transaction.category_id = mapping.category_id
                         session.commit()
                         logger.info(
@@ -740,6 +700,226 @@ class CategoryRepository:
             logger.error(f"Error auto-categorizing transaction: {str(e)}")
             return None
 
+    @staticmethod
+    def auto_categorize_transactions(
+        session: Session, transactions: Iterable[Transaction], user_id: int
+    ) -> int:
+        """
+        Auto-categorize many transactions at once.
+
+        Applies the same rules, in the same order, as auto_categorize_transaction, but loads
+        the user's counterparty and pattern mappings and categories once, resolves the
+        default-category fallback against those in-memory indexes (adding any category or
+        mapping it seeds so later transactions match it), writes batched UPDATEs per
+        category and commits once at the end.
+
+        Args:
+            session (Session): Database session.
+            transactions (Iterable[Transaction]): Transactions owned by the user.
+            user_id (int): User ID.
+
+        Returns:
+            int: Number of transactions categorized.
+        """
+        # counterparty_id -> category_id from the user's explicit counterparty mappings
+        counterparty_categories: Dict[int, int] = {}
+        for counterparty_id, category_id in session.query(
+            CounterpartyCategory.counterparty_id, CounterpartyCategory.category_id
+        ).filter(CounterpartyCategory.user_id == user_id):
+            counterparty_categories.setdefault(counterparty_id, category_id)
+
+        # Exact pattern lookups plus normalized patterns indexed for word matching:
+        # normalized pattern -> (rank, category_id), where rank is the pattern's position
+        # in the mapping list so the first listed match still wins
+        exact_patterns = {
+            CategoryType.COUNTERPARTY: {},
+            CategoryType.DESCRIPTION: {},
+        }
+        normalized_patterns = {
+            CategoryType.COUNTERPARTY: {},
+            CategoryType.DESCRIPTION: {},
+        }
+        max_pattern_words = {
+            CategoryType.COUNTERPARTY: 0,
+            CategoryType.DESCRIPTION: 0,
+        }
+        # Used by the default-category fallback: normalized pattern of any type ->
+        # category_id (first listed wins), and the raw (type, pattern) pairs that exist
+        any_type_patterns: Dict[str, int] = {}
+        existing_mappings = set()
+
+        def index_mapping(rank, mapping_type, pattern, category_id):
+            exact_patterns[mapping_type].setdefault(pattern, category_id)
+            existing_mappings.add((mapping_type, pattern))
+            any_type_patterns.setdefault(normalize_text(pattern or ""), category_id)
+            if pattern and pattern.strip():
+                normalized = normalize_text(pattern)
+                normalized_patterns[mapping_type].setdefault(
+                    normalized, (rank, category_id)
+                )
+                max_pattern_words[mapping_type] = max(
+                    max_pattern_words[mapping_type], normalized.count(" ") + 1
+                )
+
+        mapping_count = 0
+        for mapping_type, pattern, category_id in (
+            session.query(
+                CategoryMapping.mapping_type,
+                CategoryMapping.pattern,
+                CategoryMapping.category_id,
+            )
+            .join(Category)
+            .filter(Category.user_id == user_id)
+        ):
+            index_mapping(mapping_count, mapping_type, pattern, category_id)
+            mapping_count += 1
+
+        category_ids_by_name: Dict[str, int] = dict(
+            session.query(Category.name, Category.id).filter(
+                Category.user_id == user_id
+            )
+        )
+
+        def match_pattern(mapping_type: CategoryType, text: str) -> Optional[int]:
+            # Normalized text is single-spaced, so a whole-word match (see
+            # _matches_pattern) is exactly a run of consecutive words; look every run
+            # up to the longest pattern's length up in the index instead of scanning
+            # every pattern against the text
+            patterns = normalized_patterns[mapping_type]
+            if not patterns:
+                return None
+            words = normalize_text(text).split(" ")
+            max_words = max_pattern_words[mapping_type]
+            best = None
+            for start in range(len(words)):
+                for end in range(start + 1, min(start + max_words, len(words)) + 1):
+                    hit = patterns.get(" ".join(words[start:end]))
+                    if hit is not None and (best is None or hit[0] < best[0]):
+                        best = hit
+            return best[1] if best is not None else None
+
+        def suggest(counterparty_name, details) -> Optional[int]:
+            # Default-category fallback of auto_categorize_transaction, resolved against
+            # the in-memory indexes; seeded categories and mappings are only flushed
+            nonlocal mapping_count
+            suggestion = suggest_category(counterparty_name, details or None)
+            if not suggestion:
+                return None
+            mapping_type = (
+                CategoryType.COUNTERPARTY
+                if suggestion.get("mapping_type") == "COUNTERPARTY"
+                else CategoryType.DESCRIPTION
+            )
+            raw_token = (
+                suggestion.get("matched_substring")
+                or suggestion.get("matched_pattern")
+                or ""
+            )
+            pattern_token = normalize_text(raw_token)
+
+            # Respect user priority: reuse the category of a mapping for this token
+            if pattern_token in any_type_patterns:
+                return any_type_patterns[pattern_token]
+
+            # Create the category on demand
+            name = suggestion.get("name")
+            category_id = category_ids_by_name.get(name)
+            if category_id is None:
+                category = Category(
+                    user_id=user_id,
+                    name=name,
+                    description=suggestion.get("description"),
+                    color=CategoryRepository.generate_unique_color(session, user_id),
+                )
+                session.add(category)
+                session.flush()
+                category_id = category_ids_by_name[name] = category.id
+                logger.info(f"Created category: {name} for user {user_id}")
+
+            if (mapping_type, pattern_token) not in existing_mappings:
+                session.add(
+                    CategoryMapping(
+                        category_id=category_id,
+                        mapping_type=mapping_type,
+                        pattern=pattern_token,
+                    )
+                )
+                new_mappings.append((mapping_type, pattern_token, category_id))
+            index_mapping(mapping_count, mapping_type, pattern_token, category_id)
+            mapping_count += 1
+            return category_id
+
+        ids_by_category: Dict[int, List[int]] = defaultdict(list)
+        new_mappings: List[tuple] = []
+        categorized_count = 0
+        try:
+            for transaction in transactions:
+                counterparty_name = (
+                    transaction.counterparty.name
+                    if transaction.counterparty_id and transaction.counterparty
+                    else None
+                )
+                details = transaction.transaction_details
+
+                category_id = counterparty_categories.get(transaction.counterparty_id)
+                if category_id is None and counterparty_name:
+                    category_id = exact_patterns[CategoryType.COUNTERPARTY].get(
+                        counterparty_name
+                    )
+                if category_id is None and details:
+                    category_id = exact_patterns[CategoryType.DESCRIPTION].get(details)
+                if category_id is None and transaction.counterparty_id:
+                    category_id = match_pattern(
+                        CategoryType.COUNTERPARTY, counterparty_name or ""
+                    )
+                if category_id is None and details:
+                    category_id = match_pattern(CategoryType.DESCRIPTION, details)
+                if category_id is None:
+                    category_id = suggest(counterparty_name, details)
+
+                if category_id is not None:
+                    ids_by_category[category_id].append(transaction.id)
+
+            for category_id, transaction_ids in ids_by_category.items():
+                for start in range(0, len(transaction_ids), UPDATE_BATCH_SIZE):
+                    session.query(Transaction).filter(
+                        Transaction.id.in_(
+                            transaction_ids[start : start + UPDATE_BATCH_SIZE]
+                        )
+                    ).update(
+                        {Transaction.category_id: category_id},
+                        synchronize_session=False,
+                    )
+                categorized_count += len(transaction_ids)
+
+            # Like create_category_mapping, a seeded mapping also applies to the user's
+            # other transactions with exactly that text: one UPDATE per new mapping
+            user_accounts = select(Account.id).where(Account.user_id == user_id)
+            for mapping_type, pattern, category_id in new_mappings:
+                if mapping_type == CategoryType.COUNTERPARTY:
+                    match_condition = Transaction.counterparty_id.in_(
+                        select(Counterparty.id).where(Counterparty.name == pattern)
+                    )
+                else:  # DESCRIPTION
+                    match_condition = Transaction.transaction_details == pattern
+                session.query(Transaction).filter(
+                    Transaction.account_id.in_(user_accounts), match_condition
+                ).update(
+                    {Transaction.category_id: category_id},
+                    synchronize_session=False,
+                )
+
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error bulk auto-categorizing transactions: {str(e)}")
+            categorized_count = 0
+
+        logger.info(
+            f"Auto-categorized {categorized_count} transactions for user {user_id}"
+        )
+        return categorized_count
+
     @staticmethod
     def categorize_transaction(
         session: Session, transaction_id: int, category_id: int, user_id: int
@@ -811,3 +991,13 @@ class CategoryRepository:
             session.rollback()
             logger.error(f"Error categorizing transaction: {str(e)}")
             return None
+
+
+def _matches_pattern(pattern: str, text: str) -> bool:
+    """Return True if the normalized pattern appears in the normalized text as whole words."""
+    return (
+        f" {pattern} " in f" {text} "
+        or text.startswith(f"{pattern} ")
+        or text.endswith(f" {pattern}")
+        or text == pattern
+    )
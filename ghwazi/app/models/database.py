@@ -3,6 +3,7 @@ Database connection and session management for the Bank Email Parser & Account T
 """
 
 import logging
+import os
 import threading
 
 from sqlalchemy import create_engine
@@ -13,6 +14,13 @@ from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Postgres pool sizing for the process-wide engine. Every worker process gets its
+# own pool, so size these against the server's connection limit divided by the
+# number of workers.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+
 # Create SQLAlchemy base class for models
 Base = declarative_base()
 
@@ -95,9 +103,9 @@ class Database:
             if is_postgres:
                 self.engine = create_engine(
                     self.database_url,
-                    pool_size=5,
-                    max_overflow=10,
-                    pool_recycle=3600,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_recycle=DB_POOL_RECYCLE,
                     pool_pre_ping=True,
                 )
             else:
@@ -168,6 +176,34 @@ class Database:
                         connection.commit()
                     logger.info("Added description column to counterparties table")
 
+            # Ensure counterparty_categories holds one mapping per user and counterparty
+            if "counterparty_categories" in inspector.get_table_names():
+                from ..models.models import CounterpartyCategory
+
+                unique_index = next(
+                    index
+                    for index in CounterpartyCategory.__table__.indexes
+                    if index.name == "ux_counterparty_categories_user_counterparty"
+                )
+                indexes = [
+                    index["name"]
+                    for index in inspector.get_indexes("counterparty_categories")
+                ]
+                if unique_index.name not in indexes:
+                    from sqlalchemy.sql import text
+                    with self.engine.connect() as connection:
+                        # Keep the oldest mapping, which is the one that was being used
+                        connection.execute(
+                            text(
+                                "DELETE FROM counterparty_categories WHERE id NOT IN ("
+                                "SELECT id FROM (SELECT MIN(id) AS id FROM counterparty_categories "
+                                "GROUP BY user_id, counterparty_id) AS keep)"
+                            )
+                        )
+                        unique_index.create(connection)
+                        connection.commit()
+                    logger.info("Added unique (user_id, counterparty_id) index to counterparty_categories")
+
             # Tables that need user_id column
             tables_to_check = ["accounts", "email_configurations", "email_metadata"]
 
@@ -549,6 +585,16 @@ class Database:
                 except Exception as e:
                     logger.error(f"Error creating email_config_banks table: {str(e)}")
 
+            # create_all only builds indexes together with new tables, so add
+            # any indexes missing from tables created by an older schema
+            try:
+                from ..models.models import Transaction
+
+                for index in Transaction.__table__.indexes:
+                    index.create(self.engine, checkfirst=True)
+            except Exception as e:
+                logger.error(f"Error creating transactions indexes: {str(e)}")
+
             logger.info("Database tables created")
             Database._tables_created = True
             return True
@@ -567,6 +613,21 @@ class Database:
             self.connect()
         return self.Session()
 
+    def read_connection(self):
+        """
+        Get a pooled connection in autocommit mode for read-only queries.
+
+        Plain SELECTs run through it skip the BEGIN/COMMIT a session wraps
+        around every request. Use it as a context manager so the connection
+        goes back to the pool.
+
+        Returns:
+            Connection: Database connection.
+        """
+        if not self.engine:
+            self.connect()
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
     def migrate_counterparty_data(self):
         """
         Migrate existing counterparty data from transactions to the new counterparty table.
@@ -759,6 +820,7 @@ class Database:
         This method cleans up any existing international banks from the database.
         """
         try:
+            from ..models.bank import invalidate_bank_cache
             from ..models.models import Bank
 
             # Create a session
@@ -783,6 +845,7 @@ class Database:
 
             # Commit changes
             session.commit()
+            invalidate_bank_cache()
             logger.info("International banks cleanup completed")
         except Exception as e:
             logger.error(f"Error cleaning up international banks: {str(e)}")
@@ -798,6 +861,7 @@ class Database:
         This method is called when the application starts to ensure the table has the necessary data.
         """
         try:
+            from ..models.bank import invalidate_bank_cache
             from ..models.models import Bank
 
             # First cleanup any international banks
@@ -881,6 +945,7 @@ class Database:
 
             # Commit changes
             session.commit()
+            invalidate_bank_cache()
             logger.info("Banks initialized successfully")
 
         except Exception as e:
@@ -10,8 +10,8 @@ from datetime import timedelta
 import json
 from cryptography.fernet import Fernet
 from sqlalchemy import (Boolean, Column, DateTime, Enum, Float, ForeignKey,
-                        Integer, String, Text, UniqueConstraint, JSON)
-from sqlalchemy.orm import relationship
+                        Index, Integer, String, Text, UniqueConstraint, JSON)
+from sqlalchemy.orm import deferred, relationship
 from flask import current_app
 
 from .database import Base
@@ -84,7 +84,11 @@ class EmailManuConfigs(Base):
     email_host = Column(String(100), nullable=False)
     email_port = Column(Integer, nullable=False)
     email_username = Column(String(100), nullable=False)
-    _email_password = Column("email_password", String(200), nullable=False)
+    # Deferred: only the IMAP connection paths need the encrypted password,
+    # so listing and editing configurations never selects it
+    _email_password = deferred(
+        Column("email_password", String(200), nullable=False)
+    )
     email_use_ssl = Column(Boolean, default=True)
     service_provider_id = Column(
         Integer, ForeignKey("email_service_providers.id"), nullable=True
@@ -232,7 +236,11 @@ class Account(Base):
     user = relationship("User", back_populates="accounts")
     email_config = relationship("EmailManuConfigs", back_populates="accounts")
     bank = relationship("Bank", back_populates="accounts")  # Relationship to Bank model
-    transactions = relationship("Transaction", back_populates="account")
+    transactions = relationship(
+        "Transaction",
+        back_populates="account",
+        cascade="all, delete-orphan",
+    )
 
     # Composite unique constraint for user_id, email_config_id, and account_number
     # This ensures an account number can only be in one email configuration
@@ -256,7 +264,9 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True)
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    account_id = Column(
+        Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False
+    )
     email_metadata_id = Column(Integer, ForeignKey("email_metadata.id"), nullable=True)
     transaction_type = Column(Enum(TransactionType), nullable=False)
     amount = Column(Float, nullable=False)
@@ -281,6 +291,34 @@ class Transaction(Base):
     category = relationship("Category")
     counterparty = relationship("Counterparty", back_populates="transactions")
 
+    # Supports the per-account counterparty grouping and "latest transaction per
+    # counterparty" lookups. The accounts (user_id, account_number) and
+    # counterparty_categories (user_id, counterparty_id, ...) unique constraints
+    # already provide the matching indexes on the joined tables.
+    __table_args__ = (
+        Index(
+            "ix_transactions_account_counterparty_date",
+            "account_id",
+            "counterparty_id",
+            value_date.desc(),
+            postgresql_include=["transaction_details", "category_id"],
+        ),
+        # Serves the account history page: filter by account, walk newest first
+        Index(
+            "ix_transactions_account_date",
+            "account_id",
+            value_date.desc(),
+            id.desc(),
+        ),
+        # Partial index covering only the rows auto-categorization still has to visit
+        Index(
+            "ix_transactions_uncategorized",
+            "account_id",
+            postgresql_where=category_id.is_(None),
+            sqlite_where=category_id.is_(None),
+        ),
+    )
+
     # Properties for backward compatibility
     @property
     def date_time(self):
@@ -308,9 +346,9 @@ class Transaction(Base):
     @property
     def bank_name(self):
         """Property for bank_name.
-        Returns bank name from account's bank relationship if available."""
-        if self.account and self.account.bank:
-            return self.account.bank.name
+        Returns the bank name stored on the transaction's account if available."""
+        if self.account:
+            return self.account.bank_name
         return None
 
 class CounterpartyCategory(Base):
@@ -330,13 +368,14 @@ class CounterpartyCategory(Base):
     category = relationship("Category")
     user = relationship("User")
 
-    # Ensure mappings are unique per user, counterparty, and category
+    # A user maps each counterparty to at most one category; categorize_counterparty
+    # upserts against this index
     __table_args__ = (
-        UniqueConstraint(
+        Index(
+            "ux_counterparty_categories_user_counterparty",
             "user_id",
             "counterparty_id",
-            "category_id",
-            name="_user_counterparty_category_uc",
+            unique=True,
         ),
     )
 
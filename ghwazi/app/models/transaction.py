@@ -2,8 +2,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import String, or_, cast
-from sqlalchemy.orm import Session
+from sqlalchemy import String, case, cast, delete, func, or_, select, update
+from sqlalchemy.orm import Session, selectinload
 
 from .models import (
     Account,
@@ -19,6 +19,32 @@ from .user import User
 logger = logging.getLogger(__name__)
 
 
+def _account_summary_columns() -> list:
+    """Labelled per-account aggregates shared by the account summary queries."""
+
+    def sum_of(transaction_type: TransactionType):
+        return func.sum(
+            case(
+                (Transaction.transaction_type == transaction_type, Transaction.amount),
+                else_=0,
+            )
+        )
+
+    def count_of(transaction_type: TransactionType):
+        return func.count(
+            case((Transaction.transaction_type == transaction_type, 1), else_=None)
+        )
+
+    return [
+        func.count(Transaction.id).label("total_count"),
+        sum_of(TransactionType.INCOME).label("total_income"),
+        sum_of(TransactionType.EXPENSE).label("total_expense"),
+        sum_of(TransactionType.TRANSFER).label("total_transfer"),
+        count_of(TransactionType.INCOME).label("income_count"),
+        count_of(TransactionType.EXPENSE).label("expense_count"),
+    ]
+
+
 class TransactionRepository:
     """Repository class for transaction operations."""
 
@@ -165,7 +191,7 @@ class TransactionRepository:
 
     @staticmethod
     def create_account(
-        session: Session, account_data: Dict[str, Any]
+        session: Session, account_data: Dict[str, Any], commit: bool = True
     ) -> Optional[Account]:
         """
         Create a new account if not exist.
@@ -173,6 +199,9 @@ class TransactionRepository:
         Args:
             session (Session): Database session.
             account_data (Dict[str, Any]): Account data.
+            commit (bool, optional): Commit after writing. When False the account is
+                only flushed and errors propagate to the caller's transaction or
+                SAVEPOINT instead of rolling back the session. Defaults to True.
 
         Returns:
             Optional[Account]: Created account or None if creation fails.
@@ -202,18 +231,23 @@ class TransactionRepository:
             )
 
             session.add(account)
-            session.commit()
+            if commit:
+                session.commit()
+            else:
+                session.flush()
             logger.info(f"Created account: {account.account_number} for user {user_id}")
             return account
 
         except Exception as e:
+            if not commit:
+                raise
             session.rollback()
             logger.error(f"Error creating account: {str(e)}")
             return None
 
     @staticmethod
     def create_email_metadata(
-        session: Session, email_data: Dict[str, Any]
+        session: Session, email_data: Dict[str, Any], commit: bool = True
     ) -> Optional[EmailMetadata]:
         """
         Create email metadata.
@@ -221,6 +255,9 @@ class TransactionRepository:
         Args:
             session (Session): Database session.
             email_data (Dict[str, Any]): Email data.
+            commit (bool, optional): Commit after writing. When False the row is
+                only flushed and errors propagate to the caller's transaction or
+                SAVEPOINT instead of rolling back the session. Defaults to True.
 
         Returns:
             Optional[EmailMetadata]: Created email metadata or None if creation fails.
@@ -244,18 +281,23 @@ class TransactionRepository:
             )
 
             session.add(email_metadata)
-            session.commit()
-            logger.info(f"Created email metadata: {email_metadata.id}")
+            if commit:
+                session.commit()
+            else:
+                session.flush()
+            logger.info("Created email metadata: %s", email_metadata.id)
             return email_metadata
 
         except Exception as e:
+            if not commit:
+                raise
             session.rollback()
             logger.error(f"Error creating email metadata: {str(e)}")
             return None
 
     @staticmethod
     def create_transaction(
-        session: Session, transaction_data: Dict[str, Any]
+        session: Session, transaction_data: Dict[str, Any], commit: bool = True
     ) -> Optional[Transaction]:
         """
         Create a new transaction.
@@ -263,10 +305,15 @@ class TransactionRepository:
         Args:
             session (Session): Database session.
             transaction_data (Dict[str, Any]): Transaction data.
+            commit (bool, optional): Commit after writing. Pass False when storing many
+                transactions in one session: the rows are only flushed, inside a
+                SAVEPOINT so a failure discards just this transaction, and the caller
+                commits once at the end. Defaults to True.
 
         Returns:
             Optional[Transaction]: Created transaction or None if creation fails.
         """
+        savepoint = None if commit else session.begin_nested()
         try:
             # Get or create account
             account_number = transaction_data.get("account_number")
@@ -287,12 +334,15 @@ class TransactionRepository:
                 "currency": transaction_data.get("currency", "OMR"),
                 "balance": transaction_data.get("balance", 0.0),
             }
-            account = TransactionRepository.create_account(session, account_data)
+            account = TransactionRepository.create_account(
+                session, account_data, commit=commit
+            )
 
             # Update account branch only if it's null and branch is provided in transaction data
             if account and account.branch is None and transaction_data.get("branch"):
                 account.branch = transaction_data.get("branch")
-                session.commit()
+                if commit:
+                    session.commit()
 
             if not account:
                 return None
@@ -333,7 +383,7 @@ class TransactionRepository:
                 email_data = transaction_data["email_data"]
                 email_data["user_id"] = user_id
                 email_metadata = TransactionRepository.create_email_metadata(
-                    session, email_data
+                    session, email_data, commit=commit
                 )
                 if email_metadata:
                     email_metadata_id = email_metadata.id
@@ -391,7 +441,10 @@ class TransactionRepository:
             )
 
             session.add(transaction)
-            session.commit()
+            if commit:
+                session.commit()
+            else:
+                session.flush()
 
             # Check if we should update the account balance
             preserve_balance = transaction_data.get("preserve_balance", False)
@@ -431,15 +484,23 @@ class TransactionRepository:
                     logger.warning(
                         f"Unknown transaction type for transaction: {transaction.id} - not updating balance"
                     )
-                session.commit()
+                if commit:
+                    session.commit()
 
-            logger.info(f"Created transaction: {transaction.id}")
+            logger.info("Created transaction: %s", transaction.id)
             return transaction
 
         except Exception as e:
-            session.rollback()
+            if savepoint is not None and savepoint.is_active:
+                savepoint.rollback()
+            else:
+                session.rollback()
             logger.error(f"Error creating transaction: {str(e)}")
             return None
+        finally:
+            # Release the SAVEPOINT on success (and on early returns)
+            if savepoint is not None and savepoint.is_active:
+                savepoint.commit()
 
     @staticmethod
     def get_account_summary(
@@ -469,56 +530,9 @@ class TransactionRepository:
                 return None
 
             # Use more efficient SQL aggregation instead of loading all transactions
-            from sqlalchemy import case, func
-
             # Get transaction counts and sums by type
             transaction_stats = (
-                session.query(
-                    func.count(Transaction.id).label("total_count"),
-                    func.sum(
-                        case(
-                            (
-                                Transaction.transaction_type == TransactionType.INCOME,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ).label("total_income"),
-                    func.sum(
-                        case(
-                            (
-                                Transaction.transaction_type == TransactionType.EXPENSE,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ).label("total_expense"),
-                    func.sum(
-                        case(
-                            (
-                                Transaction.transaction_type
-                                == TransactionType.TRANSFER,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ).label("total_transfer"),
-                    func.count(
-                        case(
-                            (Transaction.transaction_type == TransactionType.INCOME, 1),
-                            else_=None,
-                        )
-                    ).label("income_count"),
-                    func.count(
-                        case(
-                            (
-                                Transaction.transaction_type == TransactionType.EXPENSE,
-                                1,
-                            ),
-                            else_=None,
-                        )
-                    ).label("expense_count"),
-                )
+                session.query(*_account_summary_columns())
                 .filter(Transaction.account_id == account.id)
                 .first()
             )
@@ -568,6 +582,59 @@ class TransactionRepository:
             logger.error(f"Error getting account summary: {str(e)}")
             return None
 
+    @staticmethod
+    def get_account_summaries(session: Session, user_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the summaries of all of a user's accounts in one aggregate query.
+
+        Returns the same totals and counts as get_account_summary, without its list of
+        recent transactions, so listing N accounts costs one query instead of 2N+1.
+
+        Args:
+            session (Session): Database session.
+            user_id (int): User ID.
+
+        Returns:
+            List[Dict[str, Any]]: Account summaries ordered by account ID.
+        """
+        try:
+            rows = (
+                session.query(Account, *_account_summary_columns())
+                .outerjoin(Transaction, Transaction.account_id == Account.id)
+                .filter(Account.user_id == user_id)
+                .group_by(Account.id)
+                .order_by(Account.id)
+                .all()
+            )
+
+            summaries = []
+            for row in rows:
+                account = row[0]
+                total_income = row.total_income or 0
+                total_expense = row.total_expense or 0
+                summaries.append(
+                    {
+                        "account_number": account.account_number,
+                        "bank_name": account.bank_name,
+                        "account_holder": account.account_holder,
+                        "balance": account.balance,
+                        "currency": account.currency,
+                        "transaction_count": row.total_count or 0,
+                        "total_income": total_income,
+                        "total_expense": total_expense,
+                        "total_transfer": row.total_transfer or 0,
+                        "net_balance": total_income - total_expense,
+                        "income_count": row.income_count or 0,
+                        "expense_count": row.expense_count or 0,
+                    }
+                )
+
+            return summaries
+
+        except Exception as e:
+            logger.error(f"Error getting account summaries: {str(e)}")
+            return []
+
     @staticmethod
     def get_user_accounts(session: Session, user_id: int) -> list[type[Account]] | list[Any]:
         """
@@ -790,6 +857,116 @@ class TransactionRepository:
             logger.error(f"Error deleting transaction: {str(e)}")
             return False
 
+    @staticmethod
+    def delete_user_transaction(
+        session: Session, user_id: int, transaction_id: int
+    ) -> Optional[int]:
+        """
+        Delete a transaction owned by a user and reverse its effect on the balance.
+
+        Ownership is part of the DELETE's WHERE clause, so no transaction or
+        account rows are loaded first.
+
+        Args:
+            session (Session): Database session.
+            user_id (int): User ID.
+            transaction_id (int): ID of the transaction to delete.
+
+        Returns:
+            Optional[int]: ID of the transaction's account, or None if no owned
+            transaction matched or the deletion failed.
+        """
+        try:
+            deleted = session.execute(
+                delete(Transaction)
+                .where(
+                    Transaction.id == transaction_id,
+                    Transaction.account_id.in_(
+                        select(Account.id).where(Account.user_id == user_id)
+                    ),
+                )
+                .returning(
+                    Transaction.account_id,
+                    Transaction.transaction_type,
+                    Transaction.amount,
+                ),
+                execution_options={"synchronize_session": False},
+            ).first()
+
+            if not deleted:
+                return None
+
+            # Update the account balance
+            if deleted.transaction_type == TransactionType.INCOME:
+                delta = -deleted.amount
+            elif deleted.transaction_type == TransactionType.EXPENSE:
+                delta = deleted.amount
+            else:
+                delta = None
+            if delta is not None:
+                session.execute(
+                    update(Account)
+                    .where(Account.id == deleted.account_id)
+                    .values(balance=Account.balance + delta),
+                    execution_options={"synchronize_session": False},
+                )
+
+            session.commit()
+            logger.info(f"Deleted transaction: {transaction_id}")
+            return deleted.account_id
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error deleting transaction: {str(e)}")
+            return None
+
+    @staticmethod
+    def set_user_transaction_category(
+        session: Session, user_id: int, transaction_id: int, category_id: int
+    ) -> Optional[int]:
+        """
+        Set the category of a transaction owned by a user.
+
+        Ownership is part of the UPDATE's WHERE clause, so the transaction is
+        never loaded. The caller is responsible for checking that the category
+        belongs to the same user.
+
+        Args:
+            session (Session): Database session.
+            user_id (int): User ID.
+            transaction_id (int): ID of the transaction to update.
+            category_id (int): New category ID.
+
+        Returns:
+            Optional[int]: ID of the transaction's account, or None if no owned
+            transaction matched or the update failed.
+        """
+        try:
+            account_id = session.execute(
+                update(Transaction)
+                .where(
+                    Transaction.id == transaction_id,
+                    Transaction.account_id.in_(
+                        select(Account.id).where(Account.user_id == user_id)
+                    ),
+                )
+                .values(category_id=category_id)
+                .returning(Transaction.account_id),
+                execution_options={"synchronize_session": False},
+            ).scalar()
+
+            if account_id is None:
+                return None
+
+            session.commit()
+            logger.info(f"Updated transaction: {transaction_id}")
+            return account_id
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error updating transaction: {str(e)}")
+            return None
+
     @staticmethod
     def get_transactions_by_date_range(
         session: Session,
@@ -936,8 +1113,15 @@ class TransactionRepository:
             total = query.count()
             pages = (total + per_page - 1) // per_page
 
+            # The transaction table shows each row's category and counterparty, so
+            # load them for the whole page up front instead of lazily per row
             transactions = (
-                query.order_by(Transaction.value_date.desc())
+                query.options(
+                    selectinload(Transaction.category),
+                    selectinload(Transaction.counterparty),
+                )
+                # id breaks value_date ties so rows cannot shift between pages
+                .order_by(Transaction.value_date.desc(), Transaction.id.desc())
                 .offset((page - 1) * per_page)
                 .limit(per_page)
                 .all()
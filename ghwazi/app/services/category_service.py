@@ -3,7 +3,10 @@ Category service for managing transaction categories.
 """
 
 import logging
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
 
 from ..models.category import CategoryRepository
 from ..models.database import Database
@@ -13,6 +16,75 @@ from ..utils.db_session_manager import get_session_manager, database_session
 
 logger = logging.getLogger(__name__)
 
+# Bounded LRU cache for get_user_category keyed on (category_id, user_id), shared
+# by every service instance. Categories only change through explicit edits, which invalidate
+# their entry; the TTL bounds staleness across worker processes. Entries are plain
+# CategoryInfo snapshots, never ORM instances bound to the session that loaded them.
+CATEGORY_CACHE_SIZE = 1024
+CATEGORY_CACHE_TTL = 60.0
+_category_cache: "OrderedDict[Tuple[int, int], Tuple[float, CategoryInfo]]" = OrderedDict()
+_category_cache_lock = threading.Lock()
+
+
+class CategoryInfo(NamedTuple):
+    """Session-independent snapshot of a Category's columns."""
+
+    id: int
+    user_id: int
+    name: str
+    description: Optional[str]
+    color: Optional[str]
+
+
+def _category_cache_get(key: Tuple[int, int]) -> Optional[CategoryInfo]:
+    """Return the cached category for key, or None if missing/expired."""
+    with _category_cache_lock:
+        entry = _category_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, category = entry
+        if time.monotonic() - stored_at > CATEGORY_CACHE_TTL:
+            del _category_cache[key]
+            return None
+        _category_cache.move_to_end(key)
+        return category
+
+
+def _category_cache_set(key: Tuple[int, int], category: CategoryInfo) -> None:
+    """Store category under key, evicting the least recently used entry if full."""
+    with _category_cache_lock:
+        _category_cache[key] = (time.monotonic(), category)
+        _category_cache.move_to_end(key)
+        while len(_category_cache) > CATEGORY_CACHE_SIZE:
+            _category_cache.popitem(last=False)
+
+
+def invalidate_category_cache(category_id: int, user_id: int) -> None:
+    """Drop the cached entry for a category after it is updated or deleted."""
+    with _category_cache_lock:
+        _category_cache.pop((category_id, user_id), None)
+
+
+def get_user_category(session, category_id: int, user_id: int) -> Optional[CategoryInfo]:
+    """Look up a user's category through the shared cache, on the caller's session."""
+    cache_key = (category_id, user_id)
+    cached = _category_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    category = CategoryRepository.get_category(session, category_id, user_id)
+    if category is None:
+        return None
+    info = CategoryInfo(
+        id=category.id,
+        user_id=category.user_id,
+        name=category.name,
+        description=category.description,
+        color=category.color,
+    )
+    _category_cache_set(cache_key, info)
+    return info
+
 
 class CategoryService:
     """Service for managing transaction categories."""
@@ -94,10 +166,7 @@ class CategoryService:
         """
         try:
             with database_session() as session:
-                category = CategoryRepository.get_category(
-                    session, category_id, user_id
-                )
-                return category
+                return CategoryRepository.get_category(session, category_id, user_id)
         except Exception as e:
             logger.error(f"Error getting category: {str(e)}")
             return None
@@ -128,6 +197,7 @@ class CategoryService:
                 category = CategoryRepository.update_category(
                     session, category_id, user_id, name, description, color
                 )
+                invalidate_category_cache(category_id, user_id)
                 return category
         except Exception as e:
             logger.error(f"Error updating category: {str(e)}")
@@ -149,6 +219,7 @@ class CategoryService:
                 result = CategoryRepository.delete_category(
                     session, category_id, user_id
                 )
+                invalidate_category_cache(category_id, user_id)
                 return result
         except Exception as e:
             logger.error(f"Error deleting category: {str(e)}")
@@ -283,24 +354,24 @@ class CategoryService:
         try:
             with database_session() as session:
                 # Get all uncategorized transactions for this user
-                from sqlalchemy import and_
+                from sqlalchemy.orm import selectinload
 
                 from ..models.models import Account
 
+                # Stream them in batches of 500 rather than materializing the full list;
+                # counterparties are batch-loaded per batch (one IN query) so matching
+                # below does not lazy-load them one by one
                 transactions = (
                     session.query(Transaction)
                     .join(Account)
                     .filter(Account.user_id == user_id, Transaction.category_id == None)
-                    .all()
+                    .options(selectinload(Transaction.counterparty))
+                    .yield_per(500)
                 )
 
-                categorized_count = 0
-                for transaction in transactions:
-                    result = CategoryRepository.auto_categorize_transaction(
-                        session, transaction.id, user_id
-                    )
-                    if result and result.category_id is not None:
-                        categorized_count += 1
+                categorized_count = CategoryRepository.auto_categorize_transactions(
+                    session, transactions, user_id
+                )
 
                 return categorized_count
         except Exception as e:
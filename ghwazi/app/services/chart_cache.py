@@ -0,0 +1,47 @@
+"""
+Short-lived cache for dashboard chart payloads.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Bounded LRU cache of get_chart_data results keyed on (user_id, account_number,
+# date_range). Views and import paths (email, Gmail sync, PDF upload) that change a
+# user's transactions invalidate that user's entries; the short TTL bounds
+# staleness across worker processes.
+CHART_CACHE_SIZE = 512
+CHART_CACHE_TTL = 30.0
+_chart_cache: "OrderedDict[Tuple[int, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+def chart_cache_get(key: Tuple[int, str, str]) -> Optional[Dict[str, Any]]:
+    """Return the cached chart data for key, or None if missing/expired."""
+    with _chart_cache_lock:
+        entry = _chart_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, chart_data = entry
+        if time.monotonic() - stored_at > CHART_CACHE_TTL:
+            del _chart_cache[key]
+            return None
+        _chart_cache.move_to_end(key)
+        return chart_data
+
+
+def chart_cache_set(key: Tuple[int, str, str], chart_data: Dict[str, Any]) -> None:
+    """Store chart data under key, evicting the least recently used entry if full."""
+    with _chart_cache_lock:
+        _chart_cache[key] = (time.monotonic(), chart_data)
+        _chart_cache.move_to_end(key)
+        while len(_chart_cache) > CHART_CACHE_SIZE:
+            _chart_cache.popitem(last=False)
+
+
+def invalidate_chart_cache(user_id: int) -> None:
+    """Drop every cached chart payload for a user after their transactions change."""
+    with _chart_cache_lock:
+        for key in [key for key in _chart_cache if key[0] == user_id]:
+            del _chart_cache[key]
@@ -3,17 +3,180 @@ Counterparty service for managing unique counterparty transactions.
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import aliased
 
 from ..models.category import CategoryRepository
 from ..models.database import Database
-from ..models.models import (Category, CategoryMapping, CategoryType,
+from ..models.models import (Account, Category, CategoryMapping, CategoryType,
                                Counterparty, CounterpartyCategory, Transaction)
 
 logger = logging.getLogger(__name__)
 
 # Import CategoryService for reusing category CRUD operations
-from .category_service import CategoryService
+from .category_service import CategoryService, get_user_category
+
+# Read-through cache for get_unique_counterparties, shared by every service instance
+# (views create their own instances, so invalidation must not be per-instance).
+# Keyed on (user_id, account_number); entries expire after COUNTERPARTY_CACHE_TTL seconds
+# so newly imported transactions show up without explicit invalidation.
+COUNTERPARTY_CACHE_TTL = 60.0
+_cp_cache: Dict[Tuple[int, str], Tuple[float, List[Dict[str, Any]]]] = {}
+_cp_cache_keys: Dict[int, Set[Tuple[int, str]]] = defaultdict(set)
+_cp_cache_lock = threading.Lock()
+
+
+def _cp_cache_get(key: Tuple[int, str]) -> Optional[List[Dict[str, Any]]]:
+    """Return a copy of the cached counterparties for key, or None if missing/expired."""
+    with _cp_cache_lock:
+        entry = _cp_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > COUNTERPARTY_CACHE_TTL:
+            _cp_cache.pop(key, None)
+            _cp_cache_keys[key[0]].discard(key)
+            return None
+        return [dict(item) for item in result]
+
+
+def _cp_cache_set(key: Tuple[int, str], result: List[Dict[str, Any]]) -> None:
+    """Store a copy of result under key."""
+    with _cp_cache_lock:
+        _cp_cache[key] = (time.monotonic(), [dict(item) for item in result])
+        _cp_cache_keys[key[0]].add(key)
+
+
+def invalidate_counterparty_cache(user_id: int) -> None:
+    """Drop every cached counterparty list (all accounts) for a user."""
+    with _cp_cache_lock:
+        for key in _cp_cache_keys.pop(user_id, set()):
+            _cp_cache.pop(key, None)
+
+
+def _build_unique_counterparties_stmt(filter_by_account: bool):
+    """
+    Build the get_unique_counterparties query with user_id (and optionally
+    account_number) as bind parameters, so it is constructed once per process.
+    """
+    user_id = bindparam("user_id")
+
+    # Category of each counterparty's most recent categorized transaction,
+    # used as a fallback when the user has no explicit mapping
+    latest_category = (
+        select(
+            Transaction.counterparty_id.label("counterparty_id"),
+            Category.id.label("category_id"),
+            Category.name.label("category_name"),
+            func.row_number()
+            .over(
+                partition_by=Transaction.counterparty_id,
+                order_by=Transaction.value_date.desc(),
+            )
+            .label("rn"),
+        )
+        .join(Category, Category.id == Transaction.category_id)
+        .join(Account, Account.id == Transaction.account_id)
+        .where(Account.user_id == user_id)
+        .subquery()
+    )
+    mapped_category = aliased(Category)
+
+    stmt = (
+        select(
+            Counterparty.id.label("counterparty_id"),
+            Counterparty.name.label("counterparty_name"),
+            Counterparty.description.label("description"),
+            func.max(Transaction.value_date).label("last_transaction_date"),
+            mapped_category.id.label("mapped_category_id"),
+            mapped_category.name.label("mapped_category_name"),
+            latest_category.c.category_id.label("latest_category_id"),
+            latest_category.c.category_name.label("latest_category_name"),
+        )
+        .join(Transaction, Transaction.counterparty_id == Counterparty.id)
+        .join(Account, Account.id == Transaction.account_id)
+        .outerjoin(
+            CounterpartyCategory,
+            and_(
+                CounterpartyCategory.counterparty_id == Counterparty.id,
+                CounterpartyCategory.user_id == user_id,
+            ),
+        )
+        .outerjoin(
+            mapped_category,
+            mapped_category.id == CounterpartyCategory.category_id,
+        )
+        .outerjoin(
+            latest_category,
+            and_(
+                latest_category.c.counterparty_id == Counterparty.id,
+                latest_category.c.rn == 1,
+            ),
+        )
+        .where(Account.user_id == user_id)
+    )
+
+    # Filter by account_number if requested
+    if filter_by_account:
+        stmt = stmt.where(Account.account_number == bindparam("account_number"))
+
+    # Group by counterparty ID (plus the joined category columns) and let the
+    # database return the rows already ordered by name, case-insensitively
+    return stmt.group_by(
+        Counterparty.id,
+        mapped_category.id,
+        mapped_category.name,
+        latest_category.c.category_id,
+        latest_category.c.category_name,
+    ).order_by(func.lower(Counterparty.name), Counterparty.id)
+
+
+_UNIQUE_COUNTERPARTIES_STMT = _build_unique_counterparties_stmt(False)
+_UNIQUE_COUNTERPARTIES_BY_ACCOUNT_STMT = _build_unique_counterparties_stmt(True)
+
+
+def _upsert_counterparty_category_stmt(
+    session, user_id: int, counterparty_id: int, category_id: int
+):
+    """
+    Build a single INSERT ... ON CONFLICT DO UPDATE (ON DUPLICATE KEY UPDATE on
+    MySQL) that points a user's counterparty mapping at category_id, relying on
+    the unique (user_id, counterparty_id) index.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    now = datetime.utcnow()
+    stmt = insert(CounterpartyCategory).values(
+        user_id=user_id,
+        counterparty_id=counterparty_id,
+        category_id=category_id,
+        created_at=now,
+        updated_at=now,
+    )
+    if dialect == "mysql":
+        return stmt.on_duplicate_key_update(
+            category_id=stmt.inserted.category_id,
+            updated_at=stmt.inserted.updated_at,
+        )
+    return stmt.on_conflict_do_update(
+        index_elements=[CounterpartyCategory.user_id, CounterpartyCategory.counterparty_id],
+        set_={
+            "category_id": stmt.excluded.category_id,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
 
 
 class CounterpartyService:
@@ -53,106 +216,47 @@ class CounterpartyService:
         Returns:
             List[Dict[str, Any]]: List of unique counterparties with their categories.
         """
+        cache_key = (user_id, account_number or "all")
+        cached = _cp_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             session = self.db.get_session()
 
             try:
-                # Get all counterparties that have transactions for this user
-                from sqlalchemy import case, distinct, func, outerjoin
-
-                from ..models.models import Account
-
-                # Query all counterparties with transactions for this user
-                counterparties_query = (
-                    session.query(
-                        Counterparty,
-                        func.max(Transaction.value_date).label("last_transaction_date"),
-                    )
-                    .join(Transaction, Transaction.counterparty_id == Counterparty.id)
-                    .join(Account, Account.id == Transaction.account_id)
-                    .filter(Account.user_id == user_id)
-                )
-
-                # Filter by account_number if provided
+                # Get all counterparties that have transactions for this user, together
+                # with their category, in a single round trip
+                params = {"user_id": user_id}
                 if account_number and account_number != "all":
-                    counterparties_query = counterparties_query.filter(
-                        Account.account_number == account_number
-                    )
+                    stmt = _UNIQUE_COUNTERPARTIES_BY_ACCOUNT_STMT
+                    params["account_number"] = account_number
+                else:
+                    stmt = _UNIQUE_COUNTERPARTIES_STMT
+                counterparties_data = session.execute(stmt, params).all()
 
-                # Group by counterparty ID
-                counterparties_query = counterparties_query.group_by(Counterparty.id)
-
-                # Execute the query
-                counterparties_data = counterparties_query.all()
-
-                # For each counterparty, get its categories for this user
                 result = []
                 for cp_data in counterparties_data:
-                    counterparty = cp_data[0]
-                    last_transaction_date = cp_data[1]
-                    description = counterparty.description
-
-                    # Get the user-specific category for this counterparty
-                    counterparty_category = (
-                        session.query(
-                            CounterpartyCategory, Category.name.label("category_name")
-                        )
-                        .join(Category, Category.id == CounterpartyCategory.category_id)
-                        .filter(
-                            CounterpartyCategory.counterparty_id == counterparty.id,
-                            CounterpartyCategory.user_id == user_id,
-                        )
-                        .first()
-                    )
-
-                    category_id = None
-                    category_name = None
-
-                    if counterparty_category:
-                        category_id = counterparty_category[0].category_id
-                        category_name = counterparty_category[1]
-
-                    # If no specific category mapping exists, try to get from the most recent transaction
-                    if category_id is None:
-                        latest_transaction = (
-                            session.query(
-                                Transaction,
-                                Category.name.label("category_name"),
-                                Category.id.label("category_id"),
-                            )
-                            .join(Account, Account.id == Transaction.account_id)
-                            .outerjoin(Category, Category.id == Transaction.category_id)
-                            .filter(
-                                Account.user_id == user_id,
-                                Transaction.counterparty_id == counterparty.id,
-                                Category.id != None,
-                            )
-                            .order_by(Transaction.value_date.desc())
-                            .first()
-                        )
-
-                        if latest_transaction:
-                            category_id = latest_transaction.category_id
-                            category_name = latest_transaction.category_name
+                    # Prefer the user's explicit mapping, then the latest transaction's category
+                    if cp_data.mapped_category_id is not None:
+                        category_id = cp_data.mapped_category_id
+                        category_name = cp_data.mapped_category_name
+                    else:
+                        category_id = cp_data.latest_category_id
+                        category_name = cp_data.latest_category_name
 
                     result.append(
                         {
-                            "counterparty_id": counterparty.id,
-                            "counterparty_name": counterparty.name,
-                            "description": description,
+                            "counterparty_id": cp_data.counterparty_id,
+                            "counterparty_name": cp_data.counterparty_name,
+                            "description": cp_data.description,
                             "category_name": category_name,
                             "category_id": category_id,
-                            "last_transaction_date": last_transaction_date,
+                            "last_transaction_date": cp_data.last_transaction_date,
                         }
                     )
 
-                # Sort by counterparty name
-                result.sort(
-                    key=lambda x: (
-                        x["counterparty_name"].lower() if x["counterparty_name"] else ""
-                    )
-                )
-
+                _cp_cache_set(cache_key, result)
                 return result
             finally:
                 self.db.close_session(session)
@@ -190,22 +294,18 @@ class CounterpartyService:
                 logger.error("Either counterparty_name or description must be provided")
                 return False
 
-            session = self.db.get_session()
+            # Verify the category exists and belongs to the user (cached lookup)
+            category = get_user_category(self.db.get_session(), category_id, user_id)
 
-            try:
-                # Verify the category exists and belongs to the user
-                category = (
-                    session.query(Category)
-                    .filter(Category.id == category_id, Category.user_id == user_id)
-                    .first()
+            if not category:
+                logger.error(
+                    f"Category {category_id} not found or user {user_id} does not have permission"
                 )
+                return False
 
-                if not category:
-                    logger.error(
-                        f"Category {category_id} not found or user {user_id} does not have permission"
-                    )
-                    return False
+            session = self.db.get_session()
 
+            try:
                 # Handle counterparty categorization
                 counterparty_id = None
                 if counterparty_name:
@@ -235,33 +335,15 @@ class CounterpartyService:
                             # In case model/schema doesn't support yet, avoid breaking flow
                             pass
 
-                    # Create or update CounterpartyCategory entry
-                    existing_mapping = (
-                        session.query(CounterpartyCategory)
-                        .filter(
-                            CounterpartyCategory.counterparty_id == counterparty_id,
-                            CounterpartyCategory.user_id == user_id,
+                    # Point the user's mapping for this counterparty at the category
+                    session.execute(
+                        _upsert_counterparty_category_stmt(
+                            session, user_id, counterparty_id, category_id
                         )
-                        .first()
                     )
-
-                    if existing_mapping:
-                        # Update existing mapping
-                        existing_mapping.category_id = category_id
-                        logger.info(
-                            f"Updated category mapping for counterparty {counterparty_name} to category {category.name}"
-                        )
-                    else:
-                        # Create new mapping
-                        new_mapping = CounterpartyCategory(
-                            counterparty_id=counterparty_id,
-                            category_id=category_id,
-                            user_id=user_id,
-                        )
-                        session.add(new_mapping)
-                        logger.info(
-                            f"Created new category mapping for counterparty {counterparty_name} to category {category.name}"
-                        )
+                    logger.info(
+                        f"Mapped counterparty {counterparty_name} to category {category.name}"
+                    )
 
                 # Create mapping for description if provided (keep this functionality)
                 if description:
@@ -278,66 +360,45 @@ class CounterpartyService:
                         )
 
                 # Update all matching transactions with this category
-                from sqlalchemy import and_, or_
-
-                from ..models.models import Account
-
-                # Build the filter conditions based on what was provided
-                filter_conditions = [Account.user_id == user_id]
-
+                # Build the match condition based on what was provided
                 if counterparty_id and description:
-                    # If both are provided, find transactions with either match
-                    filter_conditions.append(
-                        or_(
-                            Transaction.counterparty_id == counterparty_id,
-                            Transaction.transaction_details == description,
-                        )
+                    # If both are provided, match transactions with either
+                    match_condition = or_(
+                        Transaction.counterparty_id == counterparty_id,
+                        Transaction.transaction_details == description,
                     )
                 elif counterparty_id:
                     # Only counterparty provided
-                    filter_conditions.append(
-                        Transaction.counterparty_id == counterparty_id
-                    )
-                elif description:
+                    match_condition = Transaction.counterparty_id == counterparty_id
+                else:
                     # Only description provided
-                    filter_conditions.append(
-                        Transaction.transaction_details == description
+                    match_condition = Transaction.transaction_details == description
+
+                # Single UPDATE scoped to the user's accounts via a subquery, so the
+                # matching ids never round-trip through Python
+                update_stmt = (
+                    update(Transaction)
+                    .where(
+                        Transaction.account_id.in_(
+                            select(Account.id).where(Account.user_id == user_id)
+                        )
                     )
-
-                # Count transactions before update
-                transaction_count = (
-                    session.query(Transaction)
-                    .join(Account)
-                    .filter(*filter_conditions)
-                    .count()
+                    .where(match_condition)
+                    .values(category_id=category_id)
+                    .execution_options(synchronize_session=False)
                 )
+                transaction_count = session.execute(update_stmt).rowcount
+
+                session.commit()
+                invalidate_counterparty_cache(user_id)
 
-                if transaction_count == 0:
+                if not transaction_count:
                     logger.info(
                         f"No transactions found matching counterparty {counterparty_name} or description {description}"
                     )
                     # Still return True because we created the mappings successfully
                     return True
 
-                # Get transaction IDs that need to be updated
-                transaction_ids = [
-                    t.id
-                    for t in session.query(Transaction.id)
-                    .join(Account)
-                    .filter(*filter_conditions)
-                    .all()
-                ]
-
-                # Update transactions without using join
-                if transaction_ids:
-                    session.query(Transaction).filter(
-                        Transaction.id.in_(transaction_ids)
-                    ).update(
-                        {Transaction.category_id: category_id},
-                        synchronize_session=False,
-                    )
-
-                session.commit()
                 logger.info(
                     f"Categorized {transaction_count} transactions with counterparty {counterparty_name} or description {description} as {category.name}"
                 )
@@ -373,6 +434,7 @@ class CounterpartyService:
                 transaction = CategoryRepository.auto_categorize_transaction(
                     session, transaction_id, user_id
                 )
+                invalidate_counterparty_cache(user_id)
                 return transaction
             finally:
                 self.db.close_session(session)
@@ -395,25 +457,25 @@ class CounterpartyService:
 
             try:
                 # Get all uncategorized transactions for this user
-                from sqlalchemy import and_
-
-                from ..models.models import Account
+                from sqlalchemy.orm import selectinload
 
+                # Stream them in batches of 500 rather than materializing the full list;
+                # counterparties are batch-loaded per batch (one IN query) so matching
+                # below does not lazy-load them one by one
                 transactions = (
                     session.query(Transaction)
                     .join(Account)
                     .filter(Account.user_id == user_id, Transaction.category_id == None)
-                    .all()
+                    .options(selectinload(Transaction.counterparty))
+                    .yield_per(500)
                 )
 
-                categorized_count = 0
-                for transaction in transactions:
-                    result = CategoryRepository.auto_categorize_transaction(
-                        session, transaction.id, user_id
-                    )
-                    if result and result.category_id is not None:
-                        categorized_count += 1
+                categorized_count = CategoryRepository.auto_categorize_transactions(
+                    session, transactions, user_id
+                )
 
+                if categorized_count:
+                    invalidate_counterparty_cache(user_id)
                 return categorized_count
             finally:
                 self.db.close_session(session)
@@ -486,9 +548,12 @@ class CounterpartyService:
         Returns:
             bool: True if update was successful, False otherwise.
         """
-        return self.category_service.update_category(
+        updated = self.category_service.update_category(
             category_id, user_id, name, description, color
         )
+        if updated:
+            invalidate_counterparty_cache(user_id)
+        return updated
 
     def delete_category(self, category_id: int, user_id: int) -> bool:
         """
@@ -501,7 +566,10 @@ class CounterpartyService:
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
-        return self.category_service.delete_category(category_id, user_id)
+        deleted = self.category_service.delete_category(category_id, user_id)
+        if deleted:
+            invalidate_counterparty_cache(user_id)
+        return deleted
 
     def create_category_mapping(
         self, category_id: int, user_id: int, mapping_type: CategoryType, pattern: str
@@ -518,9 +586,12 @@ class CounterpartyService:
         Returns:
             Optional[CategoryMapping]: Created mapping or None if creation fails.
         """
-        return self.category_service.create_category_mapping(
+        mapping = self.category_service.create_category_mapping(
             category_id, user_id, mapping_type, pattern
         )
+        if mapping:
+            invalidate_counterparty_cache(user_id)
+        return mapping
 
     def delete_category_mapping(self, mapping_id: int, user_id: int) -> bool:
         """
@@ -533,7 +604,10 @@ class CounterpartyService:
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
-        return self.category_service.delete_category_mapping(mapping_id, user_id)
+        deleted = self.category_service.delete_category_mapping(mapping_id, user_id)
+        if deleted:
+            invalidate_counterparty_cache(user_id)
+        return deleted
 
     def get_category_mappings(
         self, category_id: int, user_id: int
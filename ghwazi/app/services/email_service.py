@@ -10,7 +10,7 @@ import socket
 import ssl
 import time
 from email.header import decode_header
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,24 @@ logger = logging.getLogger(__name__)
 class EmailService:
     """Service for connecting to email accounts and retrieving bank emails."""
 
+    # Bank-specific body patterns, compiled once into a single alternation so the
+    # body is scanned in one pass instead of once per pattern
+    _BANK_BODY_RE = re.compile(
+        "|".join(
+            [
+                r"bank\s*muscat",
+                r"transaction",
+                r"account\s*number",
+                r"amount\s*:",
+                r"omr\s*\d+",
+                r"debit\s*card",
+                r"credit\s*card",
+                r"balance",
+            ]
+        ),
+        re.IGNORECASE,
+    )
+
     def __init__(
         self,
         host=None,
@@ -85,21 +103,21 @@ class EmailService:
                     self.connection.sock.settimeout(60)
 
                 self.connection.login(self.username, self.password)
-                logger.info(f"Successfully connected to {self.host}")
+                logger.info("Successfully connected to %s", self.host)
                 return True
 
             except (socket.error, ssl.SSLError, imaplib.IMAP4.error) as e:
-                logger.warning(f"Connection attempt {attempt + 1} failed: {str(e)}")
+                logger.warning("Connection attempt %s failed: %s", attempt + 1, e)
                 if attempt < self.max_retries - 1:
-                    logger.info(f"Retrying in {self.retry_delay} seconds...")
+                    logger.info("Retrying in %s seconds...", self.retry_delay)
                     time.sleep(self.retry_delay)
                     # Increase delay for next retry
                     self.retry_delay *= 2
                 else:
-                    logger.error(f"All connection attempts failed for {self.host}")
+                    logger.error("All connection attempts failed for %s", self.host)
 
             except Exception as e:
-                logger.error(f"Unexpected error during connection: {str(e)}")
+                logger.error("Unexpected error during connection: %s", e)
                 logger.debug("Exception in connect: ", exc_info=True)
                 break
 
@@ -111,9 +129,9 @@ class EmailService:
             try:
                 logger.debug("Logging out from server %s", self.host)
                 self.connection.logout()
-                logger.info(f"Disconnected from {self.host}")
+                logger.info("Disconnected from %s", self.host)
             except Exception as e:
-                logger.error(f"Error during disconnect: {str(e)}")
+                logger.error("Error during disconnect: %s", e)
                 logger.debug("Exception in disconnect: ", exc_info=True)
             finally:
                 self.connection = None
@@ -133,7 +151,7 @@ class EmailService:
             self.connection.noop()
             return True
         except Exception as e:
-            logger.warning(f"Connection seems to be dead: {str(e)}")
+            logger.warning("Connection seems to be dead: %s", e)
             self.connection = None
             return self.connect()
 
@@ -157,83 +175,127 @@ class EmailService:
         Returns:
             List[Dict[str, Any]]: List of email data dictionaries.
         """
+        emails = [
+            email_data
+            for batch in self.iter_bank_emails(folder, time_period)
+            for email_data in batch
+        ]
+        logger.info("Retrieved %s bank emails", len(emails))
+        return emails
+
+    def iter_bank_emails(
+        self,
+        folder: str = "INBOX",
+        time_period: str = "only_unread",
+        batch_size: int = 200,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Retrieve bank emails lazily, in batches, so only one batch of bodies is held
+        in memory at a time.
+
+        Args:
+            folder (str): Email folder to search in.
+            time_period (str): Time period to filter emails (see get_bank_emails).
+            batch_size (int, optional): Maximum number of emails per batch.
+
+        Yields:
+            List[Dict[str, Any]]: Batches of email data dictionaries.
+        """
         if not self._reconnect_if_needed():
             logger.debug("Connection attempt failed, returning empty email list.")
-            return []
+            return
 
         try:
-            logger.debug("Selecting folder '%s'", folder)
-            status, messages = self.connection.select(folder)
-            logger.debug("Select status: %s, messages: %s", status, messages)
-            if status != "OK":
-                logger.error(f"Failed to select folder {folder}")
-                return []
-
-            # Create search criteria
-            search_criteria = []
-
-            # Handle time period filtering
-            if time_period == "only_unread":
-                search_criteria.append("UNSEEN")
-            else:
-                # Import datetime for date calculations
-                from datetime import datetime, timedelta
-
-                # Calculate date based on selected time period
-                current_date = datetime.now()
-                if time_period == "last_week":
-                    since_date = current_date - timedelta(days=7)
-                elif time_period == "last_2_weeks":
-                    since_date = current_date - timedelta(days=14)
-                elif time_period == "last_month":
-                    since_date = current_date - timedelta(days=30)
-                elif time_period == "last_3_months":
-                    since_date = current_date - timedelta(days=90)
-                elif time_period == "last_6_months":
-                    since_date = current_date - timedelta(days=180)
-                elif time_period == "last_year":
-                    since_date = current_date - timedelta(days=365)
-
-                # Format date for IMAP search (DD-MMM-YYYY)
-                date_str = since_date.strftime("%d-%b-%Y")
-                search_criteria.append(f'SINCE "{date_str}"')
-
-            # Add FROM criteria for bank email addresses
-            from_criteria = []
-            for address in self.bank_email_addresses:
-                logger.debug("Adding FROM criteria: %s", address)
-                from_criteria.append(f'FROM "{address}"')
-
-            if from_criteria:
-                logger.debug("Combining search criteria with bank addresses")
-                search_criteria.append(f"({' OR '.join(from_criteria)})")
-
-            # Execute search
-            search_query = " ".join(search_criteria)
-            logger.debug("Executing search with query: %s", search_query)
-            status, data = self.connection.search(None, search_query)
-            logger.debug("Search status: %s, data: %s", status, data)
-            if status != "OK":
-                logger.error(f"Failed to search emails with criteria: {search_query}")
-                return []
-
-            email_ids = data[0].split()
-            logger.info(f"Found {len(email_ids)} potential bank emails")
+            email_ids = self._search_bank_email_ids(folder, time_period)
+            if email_ids is None:
+                return
+            logger.info("Found %s potential bank emails", len(email_ids))
 
             # Fetch and process emails
-            emails = []
+            batch = []
             for email_id in email_ids:
                 logger.debug("Fetching email ID: %s", email_id)
                 email_data = self._fetch_email(email_id)
                 if email_data:
-                    emails.append(email_data)
-
-            logger.info(f"Retrieved {len(emails)} bank emails")
-            return emails
+                    batch.append(email_data)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+            if batch:
+                yield batch
         except Exception as e:
-            logger.error(f"Error retrieving bank emails: {str(e)}")
-            logger.debug("Exception in get_bank_emails: ", exc_info=True)
-            return []
+            logger.error("Error retrieving bank emails: %s", e)
+            logger.debug("Exception in iter_bank_emails: ", exc_info=True)
+
+    def _search_bank_email_ids(
+        self, folder: str, time_period: str
+    ) -> Optional[List[bytes]]:
+        """
+        Select the folder and search it for bank emails in the time period.
+
+        Args:
+            folder (str): Email folder to search in.
+            time_period (str): Time period to filter emails (see get_bank_emails).
+
+        Returns:
+            Optional[List[bytes]]: Matching email IDs or None if the search fails.
+        """
+        logger.debug("Selecting folder '%s'", folder)
+        status, messages = self.connection.select(folder)
+        logger.debug("Select status: %s, messages: %s", status, messages)
+        if status != "OK":
+            logger.error("Failed to select folder %s", folder)
+            return None
+
+        # Create search criteria
+        search_criteria = []
+
+        # Handle time period filtering
+        if time_period == "only_unread":
+            search_criteria.append("UNSEEN")
+        else:
+            # Import datetime for date calculations
+            from datetime import datetime, timedelta
+
+            # Calculate date based on selected time period
+            current_date = datetime.now()
+            if time_period == "last_week":
+                since_date = current_date - timedelta(days=7)
+            elif time_period == "last_2_weeks":
+                since_date = current_date - timedelta(days=14)
+            elif time_period == "last_month":
+                since_date = current_date - timedelta(days=30)
+            elif time_period == "last_3_months":
+                since_date = current_date - timedelta(days=90)
+            elif time_period == "last_6_months":
+                since_date = current_date - timedelta(days=180)
+            elif time_period == "last_year":
+                since_date = current_date - timedelta(days=365)
+
+            # Format date for IMAP search (DD-MMM-YYYY)
+            date_str = since_date.strftime("%d-%b-%Y")
+            search_criteria.append(f'SINCE "{date_str}"')
+
+        # Add FROM criteria for bank email addresses
+        from_criteria = []
+        for address in self.bank_email_addresses:
+            logger.debug("Adding FROM criteria: %s", address)
+            from_criteria.append(f'FROM "{address}"')
+
+        if from_criteria:
+            logger.debug("Combining search criteria with bank addresses")
+            search_criteria.append(f"({' OR '.join(from_criteria)})")
+
+        # Execute search
+        search_query = " ".join(search_criteria)
+        logger.debug("Executing search with query: %s", search_query)
+        status, data = self.connection.search(None, search_query)
+        logger.debug("Search status: %s, data: %s", status, data)
+        if status != "OK":
+            logger.error("Failed to search emails with criteria: %s", search_query)
+            return None
+
+        return data[0].split()
 
     def _fetch_email(self, email_id: bytes) -> Optional[Dict[str, Any]]:
         """
@@ -267,7 +329,7 @@ class EmailService:
                 )
 
                 if status != "OK":
-                    logger.error(f"Failed to fetch email {email_id}")
+                    logger.error("Failed to fetch email %s", email_id)
                     # Try with different fetch parameters on next attempt
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying with different fetch parameters...")
@@ -277,7 +339,7 @@ class EmailService:
 
                 # Validate the response structure
                 if not data or len(data) == 0:
-                    logger.error(f"Empty response for email {email_id}")
+                    logger.error("Empty response for email %s", email_id)
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying due to empty response...")
                         time.sleep(self.retry_delay)
@@ -287,7 +349,9 @@ class EmailService:
                 # Check if we have the expected tuple structure
                 if not isinstance(data[0], tuple) or len(data[0]) < 2:
                     logger.error(
-                        f"Unexpected response structure for email {email_id}: {type(data[0])}"
+                        "Unexpected response structure for email %s: %s",
+                        email_id,
+                        type(data[0]),
                     )
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying due to unexpected response structure...")
@@ -300,7 +364,9 @@ class EmailService:
                 # Validate that raw_email is bytes
                 if not isinstance(raw_email, bytes):
                     logger.error(
-                        f"Expected bytes for raw email data, got {type(raw_email)} for email {email_id}"
+                        "Expected bytes for raw email data, got %s for email %s",
+                        type(raw_email),
+                        email_id,
                     )
 
                     # Try alternative fetch methods on retry
@@ -334,7 +400,7 @@ class EmailService:
                                         continue
 
                         except Exception as e:
-                            logger.warning(f"Alternative fetch method failed: {str(e)}")
+                            logger.warning("Alternative fetch method failed: %s", e)
                             continue
                     else:
                         return None
@@ -343,7 +409,7 @@ class EmailService:
                 try:
                     msg = email.message_from_bytes(raw_email)
                 except Exception as e:
-                    logger.error(f"Failed to parse email message: {str(e)}")
+                    logger.error("Failed to parse email message: %s", e)
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying email parsing...")
                         time.sleep(self.retry_delay)
@@ -356,7 +422,7 @@ class EmailService:
                     from_addr = self._decode_header(msg["From"])
                     date = msg["Date"]
                 except Exception as e:
-                    logger.error(f"Failed to extract email headers: {str(e)}")
+                    logger.error("Failed to extract email headers: %s", e)
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying header extraction...")
                         time.sleep(self.retry_delay)
@@ -392,7 +458,7 @@ class EmailService:
                                             body += str(body_part)
                                 except Exception as e:
                                     logger.warning(
-                                        f"Error decoding email part: {str(e)}"
+                                        "Error decoding email part: %s", e
                                     )
                                     logger.debug(
                                         "Exception in decoding multipart: ",
@@ -408,12 +474,12 @@ class EmailService:
                                 else:
                                     body = str(payload)
                         except Exception as e:
-                            logger.warning(f"Error decoding email body: {str(e)}")
+                            logger.warning("Error decoding email body: %s", e)
                             logger.debug(
                                 "Exception in non-multipart decoding: ", exc_info=True
                             )
                 except Exception as e:
-                    logger.error(f"Failed to extract email body: {str(e)}")
+                    logger.error("Failed to extract email body: %s", e)
                     if attempt < self.max_retries - 1:
                         logger.info("Retrying body extraction...")
                         time.sleep(self.retry_delay)
@@ -436,28 +502,32 @@ class EmailService:
 
             except (socket.error, ssl.SSLError, imaplib.IMAP4.abort) as e:
                 logger.warning(
-                    f"Network error fetching email {email_id} (attempt {attempt + 1}): {str(e)}"
+                    "Network error fetching email %s (attempt %s): %s",
+                    email_id,
+                    attempt + 1,
+                    e,
                 )
                 if attempt < self.max_retries - 1:
                     logger.info(
-                        f"Retrying email fetch in {self.retry_delay} seconds..."
+                        "Retrying email fetch in %s seconds...", self.retry_delay
                     )
                     time.sleep(self.retry_delay)
                     # Reset connection on network errors
                     self.connection = None
                 else:
-                    logger.error(f"All fetch attempts failed for email {email_id}")
+                    logger.error("All fetch attempts failed for email %s", email_id)
 
             except Exception as e:
-                logger.error(f"Unexpected error processing email {email_id}: {str(e)}")
+                logger.error("Unexpected error processing email %s: %s", email_id, e)
                 logger.debug("Exception in _fetch_email: ", exc_info=True)
                 if attempt < self.max_retries - 1:
                     logger.info(
-                        f"Retrying due to unexpected error in {self.retry_delay} seconds..."
+                        "Retrying due to unexpected error in %s seconds...",
+                        self.retry_delay,
                     )
                     time.sleep(self.retry_delay)
                 else:
-                    logger.error(f"All retry attempts exhausted for email {email_id}")
+                    logger.error("All retry attempts exhausted for email %s", email_id)
                     break
 
         return None
@@ -497,23 +567,11 @@ class EmailService:
 
         if not is_from_bank:
             # Check body for bank-specific patterns
-            body = email_data.get("body", "").lower()
-            bank_patterns = [
-                r"bank\s*muscat",
-                r"transaction",
-                r"account\s*number",
-                r"amount\s*:",
-                r"omr\s*\d+",
-                r"debit\s*card",
-                r"credit\s*card",
-                r"balance",
-            ]
-
-            for pattern in bank_patterns:
-                if re.search(pattern, body, re.IGNORECASE):
-                    logger.debug("Email matched by body pattern: %s", pattern)
-                    is_from_bank = True
-                    break
+            body = email_data.get("body", "")
+            body_match = self._BANK_BODY_RE.search(body)
+            if body_match:
+                logger.debug("Email matched by body pattern: %s", body_match.group(0))
+                is_from_bank = True
 
         # If not from a bank or no user accounts to filter by, return the result
         if not is_from_bank or not self.user_accounts:
@@ -527,13 +585,13 @@ class EmailService:
             # Check for account number in the email body
             account_number = account.account_number.lower()
             if account_number in body:
-                logger.debug(f"Email matched user account: {account_number}")
+                logger.debug("Email matched user account: %s", account_number)
                 return True
 
             # Check for bank name in the email body
             bank_name = account.bank_name.lower()
             if bank_name in body:
-                logger.debug(f"Email matched user bank: {bank_name}")
+                logger.debug("Email matched user bank: %s", bank_name)
                 return True
 
         logger.debug("Email is from a bank but not related to user's accounts")
@@ -602,7 +660,7 @@ class EmailService:
             )
 
             if not provider:
-                logger.warning(f"No configuration found for provider: {provider_name}")
+                logger.warning("No configuration found for provider: %s", provider_name)
                 return None
 
             return {
@@ -612,7 +670,7 @@ class EmailService:
             }
 
         except Exception as e:
-            logger.error(f"Error getting provider configuration: {str(e)}")
+            logger.error("Error getting provider configuration: %s", e)
             return None
 
     @classmethod
@@ -639,7 +697,7 @@ class EmailService:
             )
 
             if not email_config:
-                logger.error(f"No email configuration found for user {user_id}")
+                logger.error("No email configuration found for user %s", user_id)
                 return None
 
             # Get user's accounts
@@ -675,7 +733,7 @@ class EmailService:
             return email_service
 
         except Exception as e:
-            logger.error(f"Error creating EmailService from user config: {str(e)}")
+            logger.error("Error creating EmailService from user config: %s", e)
             return None
 
     def _decode_header(self, header: Optional[str]) -> str:
@@ -705,6 +763,6 @@ class EmailService:
                     decoded_header += part
             return decoded_header
         except Exception as e:
-            logger.warning(f"Error decoding header: {str(e)}")
+            logger.warning("Error decoding header: %s", e)
             logger.debug("Exception in _decode_header: ", exc_info=True)
             return header
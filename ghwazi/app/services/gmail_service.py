@@ -16,6 +16,8 @@ from googleapiclient.errors import HttpError
 from ..models.database import Database
 from ..models.models import Transaction, Account, TransactionType, OAuthUser, EmailAuthConfig
 from ..models.transaction import TransactionRepository
+from .chart_cache import invalidate_chart_cache
+from .counterparty_service import invalidate_counterparty_cache
 from .google_oauth_service import GoogleOAuthService
 from .parser_service import TransactionParser
 
@@ -43,13 +45,13 @@ class GmailService:
         """
         credentials = self.oauth_service.get_valid_credentials(oauth_user)
         if not credentials:
-            logger.error(f"No valid credentials for user {oauth_user.email}")
+            logger.error("No valid credentials for user %s", oauth_user.email)
             return None
         
         try:
             return build('gmail', 'v1', credentials=credentials)
         except Exception as e:
-            logger.error(f"Error building Gmail service: {e}")
+            logger.error("Error building Gmail service: %s", e)
             return None
     
     def get_user_profile(self, oauth_user: OAuthUser) -> Optional[Dict]:
@@ -75,10 +77,10 @@ class GmailService:
                 'history_id': profile.get('historyId')
             }
         except HttpError as e:
-            logger.error(f"Gmail API error getting profile: {e}")
+            logger.error("Gmail API error getting profile: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Error getting Gmail profile: {e}")
+            logger.error("Error getting Gmail profile: %s", e)
             return None
     
     def list_labels(self, oauth_user: OAuthUser) -> List[Dict]:
@@ -111,10 +113,10 @@ class GmailService:
             ]
             
         except HttpError as e:
-            logger.error(f"Gmail API error listing labels: {e}")
+            logger.error("Gmail API error listing labels: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Error listing Gmail labels: {e}")
+            logger.error("Error listing Gmail labels: %s", e)
             return []
     
     def search_messages(self, oauth_user: OAuthUser, gmail_config: EmailAuthConfig,
@@ -184,7 +186,7 @@ class GmailService:
 
             if after_epoch is not None:
                 query_parts.append(f'after:{after_epoch}')
-                logger.info(f"Using override after epoch for search: {after_epoch}")
+                logger.info("Using override after epoch for search: %s", after_epoch)
             else:
                 # Fall back to global gmail_config.last_sync_at if available; otherwise use first-window
                 is_first_sync = not bool(gmail_config.last_sync_at)
@@ -203,21 +205,21 @@ class GmailService:
                     if cutoff_epoch is not None:
                         query_parts.append(f'after:{cutoff_epoch}')
                         logger.info(
-                            f"Using incremental Gmail sync after epoch {cutoff_epoch} (UTC {cutoff_dt.isoformat()}), has last_sync_at"
+                            "Using incremental Gmail sync after epoch %s (UTC %s), has last_sync_at", cutoff_epoch, cutoff_dt.isoformat()
                         )
                     else:
                         last_sync_date = cutoff_dt.strftime('%Y/%m/%d')
                         query_parts.append(f'after:{last_sync_date}')
-                        logger.info(f"Using incremental Gmail sync after:{last_sync_date} (fallback, has last_sync_at)")
+                        logger.info("Using incremental Gmail sync after:%s (fallback, has last_sync_at)", last_sync_date)
                 else:
                     # First sync: fetch a historical window to seed data
                     query_parts.append(f'newer_than:{first_window_days}d')
-                    logger.info(f"Using first Gmail sync window newer_than:{first_window_days}d (no last_sync_at)")
+                    logger.info("Using first Gmail sync window newer_than:%sd (no last_sync_at)", first_window_days)
             
             # Combine query parts
             query = ' '.join(query_parts) if query_parts else 'in:inbox'
             
-            logger.debug(f"Gmail search query: {query}")
+            logger.debug("Gmail search query: %s", query)
             
             # Search messages
             response = service.users().messages().list(
@@ -227,7 +229,7 @@ class GmailService:
             ).execute()
             
             messages = response.get('messages', [])
-            logger.info(f"Found {len(messages)} messages for user {oauth_user.email}")
+            logger.info("Found %s messages for user %s", len(messages), oauth_user.email)
             
             # Get detailed message information
             detailed_messages = []
@@ -239,10 +241,10 @@ class GmailService:
             return detailed_messages
             
         except HttpError as e:
-            logger.error(f"Gmail API error searching messages: {e}")
+            logger.error("Gmail API error searching messages: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Error searching Gmail messages: {e}")
+            logger.error("Error searching Gmail messages: %s", e)
             return []
     
     def get_message_detail(self, service, message_id: str) -> Optional[Dict]:
@@ -295,10 +297,10 @@ class GmailService:
             }
             
         except HttpError as e:
-            logger.error(f"Gmail API error getting message {message_id}: {e}")
+            logger.error("Gmail API error getting message %s: %s", message_id, e)
             return None
         except Exception as e:
-            logger.error(f"Error getting message detail {message_id}: {e}")
+            logger.error("Error getting message detail %s: %s", message_id, e)
             return None
     
     def _extract_message_body(self, payload: Dict) -> str:
@@ -341,7 +343,7 @@ class GmailService:
                         body = self.parser.clean_text(html_body)
         
         except Exception as e:
-            logger.error(f"Error extracting message body: {e}")
+            logger.error("Error extracting message body: %s", e)
         
         return body.strip()
     
@@ -364,7 +366,7 @@ class GmailService:
             text = re.sub(r'<[^>]+>', '', html_content)
             return re.sub(r'\s+', ' ', text).strip()
         except Exception as e:
-            logger.error(f"Error converting HTML to text: {e}")
+            logger.error("Error converting HTML to text: %s", e)
             return html_content
     
     def _parse_email_date(self, date_str: str) -> Optional[datetime]:
@@ -404,7 +406,7 @@ class GmailService:
             except ValueError:
                 continue
         
-        logger.warning(f"Could not parse email date: {date_str}")
+        logger.warning("Could not parse email date: %s", date_str)
         return None
     
     def sync_gmail_messages(self, user_id: int, account_number: str) -> Tuple[bool, str, Dict]:
@@ -462,7 +464,7 @@ class GmailService:
                     .with_for_update(nowait=False)
                     .one()
                 )
-                logger.debug(f"Account sync status before start: {locked_acc.sync_status}")
+                logger.debug("Account sync status before start: %s", locked_acc.sync_status)
                 # Evaluate current status under the lock
                 if locked_acc.sync_status == 'syncing':
                     last_update = locked_acc.updated_at
@@ -484,7 +486,7 @@ class GmailService:
                 if locked_acc.sync_status == 'completed' and locked_acc.updated_at:
                     age_sec = (datetime.utcnow() - locked_acc.updated_at).total_seconds()
                     if age_sec < cooldown_sec:
-                        logger.info(f"Account sync requested within cooldown window ({int(age_sec)}s < {cooldown_sec}s). Skipping.")
+                        logger.info("Account sync requested within cooldown window (%ss < %ss). Skipping.", int(age_sec), cooldown_sec)
                         db_session.commit()  # release lock
                         return False, "Account sync recently completed; cooldown in effect", {}
 
@@ -492,7 +494,7 @@ class GmailService:
                 locked_acc.update_sync_status('syncing')
                 db_session.commit()
             except Exception as guard_e:
-                logger.error(f"Error during per-account sync guard: {guard_e}")
+                logger.error("Error during per-account sync guard: %s", guard_e)
 
             logger.debug("Starting Gmail message search (per-account)")
             # Build per-account bank-based filters
@@ -521,11 +523,11 @@ class GmailService:
                 'transactions_created': 0,
                 'errors': 0
             }
-            logger.info(f"Found {stats['messages_found']} messages for user {oauth_user.email}")
+            logger.info("Found %s messages for user %s", stats['messages_found'], oauth_user.email)
             # Enforce strict cutoff: skip any messages received at or before account.last_sync_at
             cutoff = account.last_sync_at if account.last_sync_at else None
 
-            logger.info(f"Syncing messages with per-account cutoff {cutoff}")
+            logger.info("Syncing messages with per-account cutoff %s", cutoff)
             # Process each message for financial data
             for message in messages:
                 try:
@@ -539,7 +541,7 @@ class GmailService:
                             elif message.get('date'):
                                 msg_dt = message.get('date')
                             if msg_dt and msg_dt <= cutoff:
-                                logger.info(f"Skipping message {message.get('id')} at {msg_dt} <= last_sync_at {cutoff}")
+                                logger.info("Skipping message %s at %s <= last_sync_at %s", message.get('id'), msg_dt, cutoff)
                                 continue
                         except Exception as _:
                             # On parsing issues, fall back to processing
@@ -569,25 +571,28 @@ class GmailService:
                                             account.updated_at = datetime.now()
 
                                     stats['transactions_created'] += 1
-                                    logger.info(f"Saved transaction: {(transaction.transaction_details or '')[:50]}...")
+                                    logger.info("Saved transaction: %.50s...", transaction.transaction_details or '')
                                 else:
                                     # Already a Transaction object created by repository
                                     transaction = transaction_data
                                     stats['transactions_created'] += 1
-                                    logger.info(f"Saved transaction (repo): {(transaction.transaction_details or '')[:50]}...")
+                                    logger.info("Saved transaction (repo): %.50s...", transaction.transaction_details or '')
                                 
                             except Exception as trans_error:
-                                logger.error(f"Error saving transaction: {trans_error}")
+                                logger.error("Error saving transaction: %s", trans_error)
                                 stats['errors'] += 1
                     
                     stats['messages_processed'] += 1
                     
                 except Exception as e:
-                    logger.error(f"Error processing message {message['id']}: {e}")
+                    logger.error("Error processing message %s: %s", message['id'], e)
                     stats['errors'] += 1
             
             # Commit all transaction changes
             db_session.commit()
+            if stats['transactions_created']:
+                invalidate_counterparty_cache(user_id)
+                invalidate_chart_cache(user_id)
             
             # Update sync completion (use most recent message id by time)
             last_message_id = None
@@ -605,8 +610,8 @@ class GmailService:
                 most_recent = max(messages, key=_msg_time)
                 last_message_id = most_recent.get('id')
 
-            logger.debug(f"last_message_id: {last_message_id}")
-            logger.debug(f"stats: {stats}")
+            logger.debug("last_message_id: %s", last_message_id)
+            logger.debug("stats: %s", stats)
 
             # Mark per-account sync as completed (even if no messages found). This sets account.last_sync_at
             try:
@@ -621,18 +626,18 @@ class GmailService:
                 target_acc.update_sync_status('completed', message_id=last_message_id)
                 db_session.commit()
             except Exception as recon_e:
-                logger.error(f"Error updating account sync status to completed: {recon_e}")
+                logger.error("Error updating account sync status to completed: %s", recon_e)
                 try:
                     account.update_sync_status('completed', message_id=last_message_id)
                     db_session.commit()
                 except Exception:
                     pass
 
-            logger.info(f"Sync completed: {stats['messages_processed']} messages processed, {stats['transactions_created']} transactions created, {stats['errors']} errors")
+            logger.info("Sync completed: %s messages processed, %s transactions created, %s errors", stats['messages_processed'], stats['transactions_created'], stats['errors'])
             return True, f"Sync completed: {stats['messages_processed']} messages processed", stats
             
         except Exception as e:
-            logger.error(f"Error syncing Gmail messages: {e}")
+            logger.error("Error syncing Gmail messages: %s", e)
             # Rollback DB session to ensure clean state
             try:
                 db_session.rollback()
@@ -676,7 +681,7 @@ class GmailService:
                 acct_field = parsed.get("account_number") if isinstance(parsed, dict) else None
                 acct_field_str = str(acct_field) if acct_field is not None else ""
                 if "payment to " not in message.get("subject").strip().lower():
-                    logger.debug(f"Parsed account check for {account_number}: parsed account={parsed.get('account_number') if isinstance(parsed, dict) else None}")
+                    logger.debug("Parsed account check for %s: parsed account=%s", account_number, parsed.get('account_number') if isinstance(parsed, dict) else None)
 
                     if account_number and len(account_number) >= 4 and account_number[-3:] not in acct_field_str:
                         return transactions
@@ -727,17 +732,17 @@ class GmailService:
                             details = getattr(transaction, 'transaction_details', None)
                             if details is None and isinstance(transaction, dict):
                                 details = (transaction.get('transaction_details') or '')
-                            logger.info(f"Duplicate transaction skipped: {(details or '')[:50]}...")
+                            logger.info("Duplicate transaction skipped: %.50s...", details or '')
                         except Exception:
                             logger.info("Duplicate transaction skipped")
                 else:
-                    logger.warning(f"No account found for transaction in message {message.get('id')}")
+                    logger.warning("No account found for transaction in message %s", message.get('id'))
             else:
                 # Log that no transaction data could be parsed
-                logger.debug(f"No transaction data parsed from message: {subject[:50]}...")
+                logger.debug("No transaction data parsed from message: %.50s...", subject)
         
         except Exception as e:
-            logger.error(f"Error extracting transactions from message {message.get('id', 'unknown')}: {e}")
+            logger.error("Error extracting transactions from message %s: %s", message.get('id', 'unknown'), e)
         
         return transactions
     
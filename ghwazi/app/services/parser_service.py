@@ -6,6 +6,7 @@ import html
 import logging
 import re
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, Optional
 
 import dateutil.parser
@@ -17,6 +18,124 @@ logger = logging.getLogger(__name__)
 class TransactionParser:
     """Parser for extracting transaction data from bank emails."""
 
+    # Regexes are compiled once at class definition so parsing an email never
+    # pays for re.compile (or the re module's cache lookup) per call.
+
+    # clean_text
+    _SOFT_LINE_BREAK_RE = re.compile(r"=\r?\n")
+    _QP_HEX_CHARS = {f"{i:02X}": chr(i) for i in range(256)}
+    _WHITESPACE_RE = re.compile(r"\s+")
+
+    # _get_name
+    _NAME_DESCRIPTION_RE = re.compile(
+        r"Description\s*:\s*(.+?)(?:\s+(?:Amount|Date/Time|Transaction Country|Txn Id)\b|[\r\n]|$)",
+        re.IGNORECASE,
+    )
+    _LEADING_REFERENCE_RE = re.compile(r"^[#\s]*\d{2,}\s*[-:]\s*")
+    _NAME_SEPARATOR_RE = re.compile(r"[-:]")
+    _TWO_LETTERS_RE = re.compile(r"[A-Za-z]{2}")
+    _TRAILING_CURRENCY_RE = re.compile(
+        r"\s+(?:OMR|USD|EUR|GBP|AED|SAR|QAR|KWD|BHD|JPY)\b"
+    )
+    _MULTIPLE_SPACES_RE = re.compile(r"\s{2,}")
+    _AT_NAME_RE = re.compile(r"(?:at)\s+([A-Z](?:[A-Z\s]+[A-Z]))", re.IGNORECASE)
+    _FROM_TO_NAME_RE = re.compile(
+        r"(?:from|to)\s+([A-Z](?:[A-Z\s]+[A-Z]))", re.IGNORECASE
+    )
+    _UPPERCASE_LINE_RE = re.compile(r"\n([A-Z][A-Z\s]{4,})\n")
+    _UPPERCASE_START_RE = re.compile(r"^[A-Z][A-Z\s]")
+
+    # determine_transaction_type
+    # All keywords live in one alternation so a single scan finds the earliest
+    # one. No keyword is a prefix of another, so the leftmost match is the same
+    # one the per-keyword searches used to pick.
+    _TRANSACTION_TYPE_KEYWORDS = {
+        "credited": "income",
+        "received": "income",
+        "deposited": "income",
+        "debit": "expense",
+        "utilised": "expense",
+        "sent": "expense",
+        "payment": "expense",
+        "purchase": "expense",
+        "withdrawal": "expense",
+        "spent": "expense",
+    }
+    # ASCII-only case folding matches exactly what str.lower() would for these keywords
+    _TRANSACTION_TYPE_RE = re.compile(
+        "|".join(_TRANSACTION_TYPE_KEYWORDS), re.IGNORECASE | re.ASCII
+    )
+
+    # extract_bank_email_data
+    _ACCOUNT_RE = re.compile(
+        r"(?:\baccount\s+(xxxx\d{4})\b|Account number\s*:\s*(xxxx\d{4})\b|a/c\s+(xxxx\d{4})\b|\(?\s*a/?c\s+([0-9\*\s]{6,})\s*\)?)",
+        re.IGNORECASE,
+    )
+    _BRANCH_RE = re.compile(r"with\s+([\d\- ]*Br [A-Za-z ]+)", re.IGNORECASE)
+    # TODO: This list shuld be dynamic or configurable by the user or admin
+    _VALID_CURRENCIES = [
+        "OMR",
+        "USD",
+        "EUR",
+        "GBP",
+        "AED",
+        "SAR",
+        "QAR",
+        "KWD",
+        "BHD",
+        "JPY",
+    ]
+    _CURRENCY_AMOUNT_RE = re.compile(
+        r"\s(" + "|".join(_VALID_CURRENCIES) + r")\s*([\d,]+\.\d+|[\d,]+)",
+        re.IGNORECASE,
+    )
+    # The label-anchored field patterns below only ever see clean_text output (where
+    # all whitespace is ' ' or '\n') and English labels followed by ASCII values, so
+    # they use re.ASCII: cheaper character classes and a faster case-insensitive
+    # literal prefix search. Amount, account and name patterns stay Unicode-aware.
+    _VALUE_DATE_RE = re.compile(
+        r"value date\s+(\d{2}/\d{2}/\d{2})", re.IGNORECASE | re.ASCII
+    )
+    _DATE_TIME_RE = re.compile(
+        r"Date/Time\s*:\s*([\d]{1,2}\s+[A-Z]{3}\s+\d{2}\s+[\d:]+)",
+        re.IGNORECASE | re.ASCII,
+    )
+    _TXN_DETAILS = ["TRANSFER", "Cash Dep", "SALARY", "Mobile Payment", "Salary"]
+    # One capture group per keyword, so match.lastindex - 1 is the keyword's index
+    _TXN_DETAILS_RE = re.compile(
+        r"\b(?:" + "|".join(f"({re.escape(detail)})" for detail in _TXN_DETAILS) + r")\b",
+        re.IGNORECASE,
+    )
+    _COUNTRY_RE = re.compile(
+        r"Transaction Country\s*:\s*(.+)", re.IGNORECASE | re.ASCII
+    )
+    _DESCRIPTION_RE = re.compile(
+        r"Description\s*:\s*(.+?)(?=[:/]|$)", re.IGNORECASE | re.ASCII
+    )
+    _TXN_ID_RE = re.compile(r"Txn Id\s+(\w+)", re.IGNORECASE | re.ASCII)
+
+    # _parse_date
+    _DAY_MONTH_NAME_RE = re.compile(
+        r"(\d{1,2})\s+([A-Za-z]{3})\s+(\d{2})\s+(\d{1,2}):(\d{1,2})"
+    )
+    _NUMERIC_DATE_RE = re.compile(
+        r"(\d{1,2})/(\d{1,2})/(\d{2,4})(?:\s+(\d{1,2}):(\d{1,2}))?"
+    )
+    _MONTHS = {
+        "JAN": 1,
+        "FEB": 2,
+        "MAR": 3,
+        "APR": 4,
+        "MAY": 5,
+        "JUN": 6,
+        "JUL": 7,
+        "AUG": 8,
+        "SEP": 9,
+        "OCT": 10,
+        "NOV": 11,
+        "DEC": 12,
+    }
+
     def __init__(self):
         """Initialize the transaction parser."""
         pass
@@ -26,45 +145,46 @@ class TransactionParser:
         Clean HTML text that may be in quoted-printable format.
         Handles Bank Muscat email format with proper quoted-printable decoding.
         """
-        # Step 1: Handle quoted-printable encoding
-        # Remove soft line breaks (= at end of line followed by newline)
-        text = re.sub(r"=\r?\n", "", raw_html)
-
-        # Decode quoted-printable sequences
-        # =3D -> =, =20 -> space, =0D -> \r, =0A -> \n, etc.
-        quoted_printable_patterns = {
-            "=3D": "=",
-            "=20": " ",
-            "=0D": "\r",
-            "=0A": "\n",
-            "=09": "\t",
-            "=22": '"',
-            "=27": "'",
-            "=3C": "<",
-            "=3E": ">",
-            "=26": "&",
-        }
-
-        for encoded, decoded in quoted_printable_patterns.items():
-            text = text.replace(encoded, decoded)
-
-        # Handle any remaining =XX patterns (hexadecimal encoded characters)
-        def decode_hex(match):
-            try:
-                hex_value = match.group(1)
-                return chr(int(hex_value, 16))
-            except (ValueError, OverflowError):
+        # Plain-text bodies (no '=' escapes, entities or tags) come through steps 1-4
+        # unchanged, so only run the decoding and HTML pipeline when it can matter
+        if "=" not in raw_html and "&" not in raw_html and "<" not in raw_html:
+            text = raw_html
+        else:
+            text = self._decode_html_body(raw_html)
+
+        # Step 5: Clean up whitespace and empty lines in one pass. Normalizing
+        # whitespace within each line fixes the "Dear cus    tomer" issue; since
+        # empty lines are dropped and kept lines are stripped, the joined text has
+        # no blank lines or outer whitespace left to collapse or strip afterwards.
+        whitespace_sub = self._WHITESPACE_RE.sub
+        lines = [
+            line
+            for line in (whitespace_sub(" ", raw.strip()) for raw in text.split("\n"))
+            if line
+        ]
 
+        if len(lines) > 2:
+            lines = lines[:-2]  # Remove last 2 lines
 
+        return "\n".join(lines)
 
-                return match.group(0)  # Return original if can't decode
+    def _decode_html_body(self, raw_html: str) -> str:
+        """Decode quoted-printable and HTML entities, then extract the HTML's text."""
+        # Step 1: Handle quoted-printable encoding
+        # Remove soft line breaks (= at end of line followed by newline)
+        text = self._SOFT_LINE_BREAK_RE.sub("", raw_html)
 
-        text = re.sub(r"=([0-9A-F]{2})", decode_hex, text)
+        # Decode quoted-printable sequences (=3D -> =, =20 -> space, =0A -> \n, ...)
+        text = self._decode_qp_escapes(text)
 
         # Step 2: Decode HTML entities
         text = html.unescape(text)
 
-        # Step 3: Parse HTML with BeautifulSoup
+        # Step 3: Parse HTML with BeautifulSoup. Decoded text without tags or
+        # entities (e.g. a quoted-printable plain-text body) is already its own
+        # get_text() result, so the soup is only built when markup remains.
+        if "<" not in text and "&" not in text:
+            return text
         soup = BeautifulSoup(text, "html.parser")
 
         # Remove images and non-essential elements for cleaner text
@@ -77,60 +197,60 @@ class TransactionParser:
             br.replace_with("\n")
 
         # Extract text with newlines as separators for block elements
-        text = soup.get_text(separator="\n")
-
-        # Step 5: Clean up whitespace and empty lines
-        lines = []
-        for line in text.split("\n"):
-            # Normalize whitespace within each line - this fixes "Dear cus    tomer" issue
-            line = re.sub(r"\s+", " ", line.strip())
-            if line:  # Only keep non-empty lines
-                lines.append(line)
-
-        if len(lines) > 2:
-            lines = lines[:-2]  # Remove last 2 lines
-
-        # Join lines with single newlines
-        clean_text = "\n".join(lines)
+        return soup.get_text(separator="\n")
 
-        # Remove multiple consecutive newlines
-        clean_text = re.sub(r"\n{3,}", "\n\n", clean_text)
+    def _decode_qp_escapes(self, text: str) -> str:
+        """
+        Replace every uppercase =XX quoted-printable escape with its character.
 
-        return clean_text.strip()
+        Splits on '=' and looks each two-character prefix up in a precomputed table,
+        so there is no Python callback per escape as with re.sub. Decoded characters
+        are not rescanned, exactly like a non-overlapping =([0-9A-F]{2}) substitution.
+        """
+        if "=" not in text:
+            return text
+
+        hex_chars = self._QP_HEX_CHARS
+        parts = text.split("=")
+        decoded = [parts[0]]
+        for part in parts[1:]:
+            char = hex_chars.get(part[:2])
+            if char is None:
+                decoded.append("=")
+                decoded.append(part)
+            else:
+                decoded.append(char)
+                decoded.append(part[2:])
+        return "".join(decoded)
 
     def _get_name(self, email_text: str) -> Optional[str]:
         """Extract counterparty/merchant name from email text."""
         # 1) Prefer extracting from the 'Description :' field. Stop before Amount/Date/Time/etc.
-        desc_match = re.search(
-            r"Description\s*:\s*(.+?)(?:\s+(?:Amount|Date/Time|Transaction Country|Txn Id)\b|[\r\n]|$)",
-            email_text,
-            re.IGNORECASE,
-        )
+        desc_match = self._NAME_DESCRIPTION_RE.search(email_text)
         if desc_match:
             raw = desc_match.group(1).strip()
 
             # Remove leading numeric reference like "911792-" or "911792 :"
-            raw = re.sub(r"^[#\s]*\d{2,}\s*[-:]\s*", "", raw)
+            raw = self._LEADING_REFERENCE_RE.sub("", raw)
             # If there are multiple separators, pick the most name-like (usually the last text part)
-            parts = [p.strip() for p in re.split(r"[-:]", raw) if p.strip()]
+            parts = [p.strip() for p in self._NAME_SEPARATOR_RE.split(raw) if p.strip()]
             candidate = None
             for p in reversed(parts):
-                if re.search(r"[A-Za-z]{2}", p):
+                if self._TWO_LETTERS_RE.search(p):
                     candidate = p
                     break
             name = candidate or raw
 
             # Guard against any leaked currency/amount tokens
-            name = re.split(r"\s+(?:OMR|USD|EUR|GBP|AED|SAR|QAR|KWD|BHD|JPY)\b", name)[0]
+            name = self._TRAILING_CURRENCY_RE.split(name)[0]
 
             # Normalize whitespace
-            name = re.sub(r"\s{2,}", " ", name).strip()
+            name = self._MULTIPLE_SPACES_RE.sub(" ", name).strip()
             if name:
                 return name
 
         # 2) Fallback: try explicit "at NAME" pattern
-        counterparty_re1 = re.compile(r"(?:at)\s+([A-Z](?:[A-Z\s]+[A-Z]))", re.IGNORECASE)
-        counterparty_match1 = counterparty_re1.search(email_text)
+        counterparty_match1 = self._AT_NAME_RE.search(email_text)
         if counterparty_match1:
             name = " ".join(counterparty_match1.group(1).split())
             if name.upper().startswith("TRANSFER"):
@@ -140,8 +260,7 @@ class TransactionParser:
             return name
 
         # 2) Fallback: try explicit "from/to NAME" pattern
-        counterparty_re2 = re.compile(r"(?:from|to)\s+([A-Z](?:[A-Z\s]+[A-Z]))", re.IGNORECASE)
-        counterparty_match = counterparty_re2.search(email_text)
+        counterparty_match = self._FROM_TO_NAME_RE.search(email_text)
         if counterparty_match:
             name = " ".join(counterparty_match.group(1).split())
             if name.upper().startswith("TRANSFER"):
@@ -151,10 +270,9 @@ class TransactionParser:
             return name
 
         # 3) Last resort: uppercase block between newlines
-        counterparty_re3 = re.compile(r"\n([A-Z][A-Z\s]{4,})\n", re.MULTILINE)
-        names = counterparty_re3.findall(email_text)
-        if names:
-            name = " ".join(names[0].split())
+        uppercase_match = self._UPPERCASE_LINE_RE.search(email_text)
+        if uppercase_match:
+            name = " ".join(uppercase_match.group(1).split())
             if name.upper().startswith("TRANSFER"):
                 name = name[8:].strip()
             if name.endswith("from your a") or name.endswith("in your a"):
@@ -178,7 +296,7 @@ class TransactionParser:
                     continue
 
                 # if re.match(r'^[A-Z][A-Z\s]{2,50}$', line):
-                if re.match(r'^[A-Z][A-Z\s]', line):
+                if self._UPPERCASE_START_RE.match(line):
                     # Additional validation: should contain mostly letters
                     # if re.search(r'[A-Za-z]', line) and len(re.findall(r'[A-Za-z]', line)) >= len(line) * 0.7:
                     name = ' '.join(line.split())
@@ -192,38 +310,10 @@ class TransactionParser:
         found in the email content.
         Returns one of: 'income', 'expense', 'transfer', 'unknown'.
         """
-        text = email_text.lower()
-
-        pattern_types = {
-            "income": [
-                r"credited",
-                r"received",
-                r"deposited",
-            ],
-            "expense": [
-                r"debit",
-                r"utilised",
-                r"sent",
-                r"payment",
-                r"purchase",
-                r"withdrawal",
-                r"spent",
-            ],
-        }
-
-        earliest_type = "unknown"
-        earliest_index = len(text) + 1
-
-        for type_name, patterns in pattern_types.items():
-            for pattern in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    pos = match.start()
-                    if pos < earliest_index:
-                        earliest_index = pos
-                        earliest_type = type_name
-
-        return earliest_type
+        match = self._TRANSACTION_TYPE_RE.search(email_text)
+        if match:
+            return self._TRANSACTION_TYPE_KEYWORDS[match.group(0).lower()]
+        return "unknown"
 
     def extract_bank_email_data(self, email_text: str) -> Dict[str, Optional[str]]:
         """Extract structured data from bank email text."""
@@ -244,26 +334,34 @@ class TransactionParser:
             "country": None,
         }
 
+        # Labelled fields are only searched for when their label is present; a
+        # substring test on a lowercased copy is far cheaper than a failed
+        # case-insensitive regex scan over the whole body. Each of those regexes
+        # starts with its label, so the scan can also begin at the label's first
+        # occurrence rather than at the top of the body.
+        lowered_text = email_text.lower()
+        aligned = len(lowered_text) == len(email_text)
+
+        def label_pos(label: str) -> int:
+            pos = lowered_text.find(label)
+            # Offsets only carry over if lowercasing kept the length unchanged
+            return pos if pos < 0 or aligned else 0
+
         # Account number (xxxx + digits)
-        account_re = re.compile(
-            r"(?:\baccount\s+(xxxx\d{4})\b|Account number\s*:\s*(xxxx\d{4})\b|a/c\s+(xxxx\d{4})\b|\(?\s*a/?c\s+([0-9\*\s]{6,})\s*\)?)",
-            re.IGNORECASE,
-        )
-        acc_match = account_re.search(email_text)
+        acc_match = self._ACCOUNT_RE.search(email_text)
         if acc_match:
             acc_val = acc_match.group(1) or acc_match.group(2) or acc_match.group(3)
             if not acc_val:
                 masked = acc_match.group(4)
                 if masked:
-                    masked = re.sub(r"\s+", "", masked)
+                    masked = self._WHITESPACE_RE.sub("", masked)
                     if "*" in masked:
                         acc_val = masked
             data["account_number"] = acc_val
 
 
         # Branch/location (digits + 'Br' + text)
-        branch_re = re.compile(r"with\s+([\d\- ]*Br [A-Za-z ]+)", re.IGNORECASE)
-        branch_match = branch_re.search(email_text)
+        branch_match = self._BRANCH_RE.search(email_text)
         if branch_match:
             data["branch"] = branch_match.group(1).strip()
 
@@ -274,27 +372,8 @@ class TransactionParser:
         #     data["transaction_type"] = type_match.group(1).lower()
 
         # Amount and currency: Currency code with decimal or integer (with optional commas)
-        # Valid currency codes (ISO 4217)
-        # TODO: This list shuld be dynamic or configurable by the user or admin
-        valid_currencies = [
-            "OMR",
-            "USD",
-            "EUR",
-            "GBP",
-            "AED",
-            "SAR",
-            "QAR",
-            "KWD",
-            "BHD",
-            "JPY",
-        ]
-
-        # Create pattern that matches valid currency codes
-        currency_pattern = (
-            r"\s(" + "|".join(valid_currencies) + r")\s*([\d,]+\.\d+|[\d,]+)"
-        )
-        currency_re = re.compile(currency_pattern, re.IGNORECASE)
-        currency_match = currency_re.search(email_text)
+        # Valid currency codes (ISO 4217) are listed in _VALID_CURRENCIES
+        currency_match = self._CURRENCY_AMOUNT_RE.search(email_text)
         if currency_match:
             data["currency"] = currency_match.group(1).upper()
             # Extract the first amount associated with the first currency occurrence
@@ -303,38 +382,43 @@ class TransactionParser:
 
 
         # Date (two formats): "value date dd/mm/yy" or "Date/Time : 22 JUN 25 20:29"
-        date_re1 = re.compile(r"value date\s+(\d{2}/\d{2}/\d{2})", re.IGNORECASE)
-        date_re2 = re.compile(
-            r"Date/Time\s*:\s*([\d]{1,2}\s+[A-Z]{3}\s+\d{2}\s+[\d:]+)", re.IGNORECASE
-        )
-        date_match = date_re1.search(email_text) or date_re2.search(email_text)
+        date_match = None
+        pos = label_pos("value date")
+        if pos >= 0:
+            date_match = self._VALUE_DATE_RE.search(email_text, pos)
+        if not date_match:
+            pos = label_pos("date/time")
+            if pos >= 0:
+                date_match = self._DATE_TIME_RE.search(email_text, pos)
         if date_match:
             data["date"] = date_match.group(1).strip()
 
 
         # Transaction details keywords: e.g., TRANSFER, Cash Dep, SALARY, Mobile Payment
-        # We'll pick the first occurrence from a known list, case-insensitive
-        txn_details_list = [
-            "TRANSFER",
-            "Cash Dep",
-            "SALARY",
-            "Mobile Payment",
-            "Salary",
-        ]
-        for detail in txn_details_list:
-            if re.search(r"\b" + re.escape(detail) + r"\b", email_text, re.IGNORECASE):
-                data["transaction_details"] = detail
-                break
+        # We'll pick the first keyword of the known list that occurs, case-insensitive.
+        # One scan finds every occurrence (the keywords cannot overlap at word
+        # boundaries); the lowest list index wins, not the earliest position.
+        best_index = None
+        for detail_match in self._TXN_DETAILS_RE.finditer(email_text):
+            if best_index is None or detail_match.lastindex < best_index:
+                best_index = detail_match.lastindex
+                if best_index == 1:
+                    break
+        if best_index is not None:
+            data["transaction_details"] = self._TXN_DETAILS[best_index - 1]
 
         # Country: "Transaction Country : <text>"
-        country_re = re.compile(r"Transaction Country\s*:\s*(.+)", re.IGNORECASE)
-        country_match = country_re.search(email_text)
-        if country_match:
-            data["country"] = country_match.group(1).strip()
+        pos = label_pos("transaction country")
+        if pos >= 0:
+            country_match = self._COUNTRY_RE.search(email_text, pos)
+            if country_match:
+                data["country"] = country_match.group(1).strip()
 
         # Description: "Description : <text>"
-        desc_re = re.compile(r"Description\s*:\s*(.+?)(?=[:/]|$)", re.IGNORECASE)
-        desc_match = desc_re.search(email_text)
+        desc_match = None
+        pos = label_pos("description")
+        if pos >= 0:
+            desc_match = self._DESCRIPTION_RE.search(email_text, pos)
         description = None
         if desc_match:
             description = desc_match.group(1).strip()
@@ -345,12 +429,13 @@ class TransactionParser:
         if counterparty_name:
             data["counterparty_name"] = counterparty_name
         elif description:
-            data["counterparty_name"] = "-".join(description.split("-")[1:]).strip()
+            data["counterparty_name"] = description.partition("-")[2].strip()
 
-        txn_id_re = re.compile(r"Txn Id\s+(\w+)", re.IGNORECASE)
-        txn_id_match = txn_id_re.search(email_text)
-        if txn_id_match:
-            data["transaction_id"] = txn_id_match.group(1)
+        pos = label_pos("txn id")
+        if pos >= 0:
+            txn_id_match = self._TXN_ID_RE.search(email_text, pos)
+            if txn_id_match:
+                data["transaction_id"] = txn_id_match.group(1)
 
         # Determine transaction type using the helper function
         txn_type = self.determine_transaction_type(email_text)
@@ -387,7 +472,7 @@ class TransactionParser:
         """
         try:
             body = email_data.get("body") or email_data.get("body_text", "")
-            if not body:
+            if not body or body.isspace():
                 logger.warning("Email body is empty, cannot parse transaction")
                 return None
 
@@ -417,7 +502,8 @@ class TransactionParser:
                     transaction_data["amount"] = float(extracted_data["amount"])
                 except (ValueError, TypeError):
                     logger.warning(
-                        f"Could not convert amount to float: {extracted_data['amount']}"
+                        "Could not convert amount to float: %s",
+                        extracted_data["amount"],
                     )
             if extracted_data.get("country"):
                 transaction_data["country"] = extracted_data["country"].split()[0]
@@ -437,35 +523,23 @@ class TransactionParser:
                         # Use email date as fallback for Gmail transactions
                         email_date = email_data.get("date")
                         if email_date:
-                            if isinstance(email_date, datetime):
-                                transaction_data["value_date"] = email_date
-                            elif isinstance(email_date, str):
-                                try:
-                                    transaction_data["value_date"] = datetime.fromisoformat(email_date.replace('Z', '+00:00'))
-                                except ValueError:
-                                    # Try parsing with dateutil as fallback
-                                    import dateutil.parser
-                                    transaction_data["value_date"] = dateutil.parser.parse(email_date)
+                            email_dt = self._parse_email_date(email_date)
+                            if email_dt:
+                                transaction_data["value_date"] = email_dt
                 except Exception as e:
                     logger.warning(
-                        f"Failed to parse date '{extracted_data['date']}': {str(e)}"
+                        "Failed to parse date '%s': %s", extracted_data["date"], e
                     )
             else:
                 # If no transaction date found in email body, use email date for Gmail
                 email_date = email_data.get("date")
                 if email_date:
                     try:
-                        if isinstance(email_date, datetime):
-                            transaction_data["value_date"] = email_date
-                        elif isinstance(email_date, str):
-                            try:
-                                transaction_data["value_date"] = datetime.fromisoformat(email_date.replace('Z', '+00:00'))
-                            except ValueError:
-                                # Try parsing with dateutil as fallback
-                                import dateutil.parser
-                                transaction_data["value_date"] = dateutil.parser.parse(email_date)
+                        email_dt = self._parse_email_date(email_date)
+                        if email_dt:
+                            transaction_data["value_date"] = email_dt
                     except Exception as e:
-                        logger.warning(f"Failed to parse email date '{email_date}': {str(e)}")
+                        logger.warning("Failed to parse email date '%s': %s", email_date, e)
 
 
             # Validate that we have minimum required data
@@ -476,9 +550,40 @@ class TransactionParser:
             return transaction_data
 
         except Exception as e:
-            logger.error(f"Error parsing email: {str(e)}")
+            logger.error("Error parsing email: %s", e)
+            return None
+
+    def _parse_email_date(self, email_date: Any) -> Optional[datetime]:
+        """
+        Parse the email's own date, used when the body carries no transaction date.
+
+        Gmail hands over a datetime, IMAP the raw RFC 2822 ``Date:`` header; the
+        dedicated parsers are tried before falling back to dateutil's heuristics.
+
+        Args:
+            email_date (Any): datetime, ISO 8601 string or RFC 2822 date header.
+
+        Returns:
+            Optional[datetime]: Parsed datetime or None for unsupported types.
+        """
+        if isinstance(email_date, datetime):
+            return email_date
+        if not isinstance(email_date, str):
             return None
 
+        try:
+            return datetime.fromisoformat(email_date.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+
+        try:
+            # e.g. "Wed, 13 May 2025 17:20:00 +0400"
+            return parsedate_to_datetime(email_date)
+        except (TypeError, ValueError, IndexError):
+            pass
+
+        return dateutil.parser.parse(email_date)
+
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """
         Parse date string to datetime object.
@@ -500,26 +605,10 @@ class TransactionParser:
             # First try custom parsing for specific formats to ensure DD/MM/YY interpretation
 
             # Format: 13 MAY 25 17:20
-            match = re.match(
-                r"(\d{1,2})\s+([A-Za-z]{3})\s+(\d{2})\s+(\d{1,2}):(\d{1,2})", date_str
-            )
+            match = self._DAY_MONTH_NAME_RE.match(date_str)
             if match:
                 day, month_str, year, hour, minute = match.groups()
-                month_map = {
-                    "JAN": 1,
-                    "FEB": 2,
-                    "MAR": 3,
-                    "APR": 4,
-                    "MAY": 5,
-                    "JUN": 6,
-                    "JUL": 7,
-                    "AUG": 8,
-                    "SEP": 9,
-                    "OCT": 10,
-                    "NOV": 11,
-                    "DEC": 12,
-                }
-                month = month_map.get(month_str.upper(), 1)
+                month = self._MONTHS.get(month_str.upper(), 1)
 
                 # Handle two-digit years properly
                 current_year = datetime.now().year
@@ -535,9 +624,7 @@ class TransactionParser:
                 return datetime(full_year, month, int(day), int(hour), int(minute))
 
             # Format: DD/MM/YY HH:MM - Handle time component
-            match = re.match(
-                r"(\d{1,2})/(\d{1,2})/(\d{2,4})(?:\s+(\d{1,2}):(\d{1,2}))?", date_str
-            )
+            match = self._NUMERIC_DATE_RE.match(date_str)
             if match:
                 groups = match.groups()
                 month, day, year = groups[0:3]
@@ -565,7 +652,7 @@ class TransactionParser:
                 return datetime(full_year, int(month), int(day), hour, minute)
 
         except Exception as e:
-            logger.warning(f"Failed to parse date with custom parser: {str(e)}")
+            logger.warning("Failed to parse date with custom parser: %s", e)
 
         try:
             # Only try dateutil as fallback, and force DD/MM/YY interpretation
@@ -588,7 +675,7 @@ class TransactionParser:
 
             return dt
         except Exception as e:
-            logger.warning(f"Failed to parse date with dateutil: {str(e)}")
+            logger.warning("Failed to parse date with dateutil: %s", e)
 
         return None
 
@@ -604,18 +691,18 @@ class TransactionParser:
             bool: True if data is valid, False otherwise.
         """
 
-        logger.info(f"Validating transaction data: {data}")
+        logger.info("Validating transaction data: %s", data)
         # Check required fields exist
         required_fields = ["transaction_type", "account_number", "amount"]
         for field in required_fields:
             if field not in data or data[field] is None:
-                logger.warning(f"Missing required field: {field}")
+                logger.warning("Missing required field: %s", field)
                 return False
 
         # Validate transaction_type
         valid_types = ["income", "expense", "transfer", "unknown"]
         if data["transaction_type"] not in valid_types:
-            logger.warning(f"Invalid transaction_type: {data['transaction_type']}")
+            logger.warning("Invalid transaction_type: %s", data["transaction_type"])
             data["transaction_type"] = "unknown"  # Set to default if invalid
 
         # Validate account_number
@@ -623,7 +710,7 @@ class TransactionParser:
             not isinstance(data["account_number"], str)
             or not data["account_number"].strip()
         ):
-            logger.warning(f"Invalid account_number: {data['account_number']}")
+            logger.warning("Invalid account_number: %s", data["account_number"])
             return False
 
         # Validate amount
@@ -634,19 +721,19 @@ class TransactionParser:
 
             # Check for unreasonable amounts (e.g., negative or extremely large)
             if data["amount"] < 0:
-                logger.warning(f"Negative amount: {data['amount']}")
+                logger.warning("Negative amount: %s", data["amount"])
                 # Don't return False, just log the warning
             elif data["amount"] > 1000000:  # Arbitrary large amount threshold
-                logger.warning(f"Unusually large amount: {data['amount']}")
+                logger.warning("Unusually large amount: %s", data["amount"])
                 # Don't return False, just log the warning
         except (ValueError, TypeError):
-            logger.warning(f"Invalid amount: {data['amount']}")
+            logger.warning("Invalid amount: %s", data["amount"])
             return False
 
         # Validate value_date if present
         if "value_date" in data and data["value_date"] is not None:
             if not isinstance(data["value_date"], datetime):
-                logger.warning(f"Invalid value_date: {data['value_date']}")
+                logger.warning("Invalid value_date: %s", data["value_date"])
                 return False
 
         return True
@@ -7,12 +7,19 @@ from typing import Any, Dict, List, Optional
 
 from ..models.database import Database
 from ..models.transaction import TransactionRepository
+from .chart_cache import invalidate_chart_cache
+from .counterparty_service import invalidate_counterparty_cache
 from .email_service import EmailService
 from .parser_service import TransactionParser
 from ..utils.db_session_manager import database_session
 
 logger = logging.getLogger(__name__)
 
+# Number of emails process_emails fetches per batch. Each batch is parsed in this
+# process by the service's single TransactionParser, one email after another, and
+# its transactions are committed together before the next batch is fetched.
+EMAIL_BATCH_SIZE = 200
+
 
 class TransactionService:
     """Service for processing emails and storing transaction data."""
@@ -35,37 +42,54 @@ class TransactionService:
         Returns:
             int: Number of transactions processed.
         """
+        # Users whose transactions were imported, for cache invalidation
+        user_ids = set()
         try:
-            # Get bank emails
-            emails = self.email_service.get_bank_emails(folder, unread_only)
-            if not emails:
-                logger.info("No bank emails found")
-                return 0
-
-            logger.info(f"Processing {len(emails)} bank emails")
-
-            # Process each email
+            # Fetch bank emails in batches so only one batch of bodies is in memory
+            email_count = 0
             processed_count = 0
             with database_session() as session:
-                for email_data in emails:
-                    # Parse email
-                    transaction_data = self.parser.parse_email(email_data)
-                    if not transaction_data:
-                        logger.warning(f"Failed to parse email {email_data.get('id')}")
-                        continue
-
-                    # Store transaction
-                    transaction = TransactionRepository.create_transaction(
-                        session, transaction_data
-                    )
-                    if transaction:
-                        processed_count += 1
-
-                logger.info(f"Processed {processed_count} transactions")
+                for emails in self.email_service.iter_bank_emails(
+                    folder, unread_only, batch_size=EMAIL_BATCH_SIZE
+                ):
+                    email_count += len(emails)
+                    logger.info("Processing %s bank emails", len(emails))
+
+                    # Store each transaction; rows are flushed per email and committed
+                    # once per batch instead of paying a commit per transaction
+                    for email_data in emails:
+                        # Parse email
+                        transaction_data = self.parser.parse_email(email_data)
+                        if not transaction_data:
+                            logger.warning(
+                                "Failed to parse email %s", email_data.get("id")
+                            )
+                            continue
+
+                        # Store transaction
+                        transaction = TransactionRepository.create_transaction(
+                            session, transaction_data, commit=False
+                        )
+                        if transaction:
+                            processed_count += 1
+                            user_ids.add(transaction_data.get("user_id"))
+
+                    session.commit()
+
+                if not email_count:
+                    logger.info("No bank emails found")
+                    return 0
+
+                logger.info("Processed %s transactions", processed_count)
                 return processed_count
         except Exception as e:
-            logger.error(f"Error processing emails: {str(e)}")
+            logger.error("Error processing emails: %s", e)
             return 0
+        finally:
+            # Batches are committed as they go, so drop cached reads even on failure
+            for user_id in user_ids:
+                invalidate_counterparty_cache(user_id)
+                invalidate_chart_cache(user_id)
 
     def get_account_summaries(self) -> List[Dict[str, Any]]:
         """
@@ -92,7 +116,7 @@ class TransactionService:
 
                 return summaries
         except Exception as e:
-            logger.error(f"Error getting account summaries: {str(e)}")
+            logger.error("Error getting account summaries: %s", e)
             return []
 
     def get_account_summary(
@@ -116,7 +140,7 @@ class TransactionService:
                 return summary
         except Exception as e:
             logger.error(
-                f"Error getting account summary for {account_number}: {str(e)}"
+                "Error getting account summary for %s: %s", account_number, e
             )
             return None
 
@@ -126,4 +150,4 @@ class TransactionService:
             self.email_service.disconnect()
             logger.info("Closed email connection")
         except Exception as e:
-            logger.error(f"Error closing email connection: {str(e)}")
+            logger.error("Error closing email connection: %s", e)
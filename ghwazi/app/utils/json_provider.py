@@ -0,0 +1,46 @@
+"""
+orjson-backed JSON provider for Flask responses.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize with orjson, keeping Flask's output for the types orjson skips.
+
+    Datetimes are passed through to Flask's default handler so they keep the
+    HTTP-date format jsonify has always produced, and Decimal, __html__ etc.
+    go through it too. Anything orjson rejects outright (e.g. integers wider
+    than 64 bits) falls back to the standard library encoder. Parsing stays on
+    the standard library; request bodies are small.
+    """
+
+    _OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson is not None
+        else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        option = self._OPTIONS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(
+                obj, default=kwargs.get("default", self.default), option=option
+            ).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+
+def init_json_provider(app):
+    """Install the orjson provider on app when orjson is available."""
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -1,22 +1,28 @@
 import logging
 from datetime import datetime, timedelta
 
-from flask import (Blueprint, flash, jsonify, redirect, render_template,
-                   request, session, url_for)
+from flask import (Blueprint, current_app, flash, jsonify, redirect,
+                   render_template, request, session, url_for)
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import raiseload
 
-from ..models import (Account, Bank, Category, CategoryMapping,
-                     EmailManuConfigs, Transaction)
+from ..models import Account, Category, CategoryMapping, Transaction
+from ..models.bank import BankRepository
 from ..models.database import Database
+from ..models.models import Budget
 from ..models.transaction import TransactionRepository
 from ..models.user import User
 from ..services.auto_sync_service import EmailSync
+from ..services.chart_cache import invalidate_chart_cache
 from ..services.counterparty_service import CounterpartyService
 from ..utils.decorators import login_required
 
 # Create blueprint
 account_bp = Blueprint("account", __name__)
 
-# Initialize database and logger
+# Initialize database and logger. db.get_session() hands out the thread's scoped
+# session, which the app's after_request/teardown hooks remove, so the views
+# below do not close it themselves.
 db = Database()
 logger = logging.getLogger(__name__)
 counterparty_service = CounterpartyService()
@@ -133,6 +139,29 @@ def _start_account_sync_background(user_id: int, account_number: str):
     t.start()
     return True
 
+# Built once; each request only binds the user id and account number
+_ACCOUNT_BY_NUMBER = (
+    select(Account)
+    .where(
+        Account.user_id == bindparam("user_id"),
+        Account.account_number == bindparam("account_number"),
+    )
+    .limit(1)
+)
+
+
+def _account_load_options():
+    """Loader options for single-account queries.
+
+    With SQLA_STRICT_LOADING set (development/testing), any relationship access
+    raises instead of lazy loading. The account pages only need the bank name
+    and currency, which Account stores itself.
+    """
+    if current_app.config.get("SQLA_STRICT_LOADING"):
+        return (raiseload("*"),)
+    return ()
+
+
 # Helper: validate account number (digits only, length 6–20)
 def _validate_account_number(raw: str) -> tuple[bool, str, str]:
     """
@@ -170,24 +199,14 @@ def accounts():
     user_id = session.get("user_id")
     db_session = db.get_session()
     try:
-        # Get user's accounts
-        accounts = TransactionRepository.get_user_accounts(db_session, user_id)
-
-        summaries = []
-        for account in accounts:
-            summary = TransactionRepository.get_account_summary(
-                db_session, user_id, account.account_number
-            )
-            if summary:
-                summaries.append(summary)
+        # Summaries of all the user's accounts in one aggregate query
+        summaries = TransactionRepository.get_account_summaries(db_session, user_id)
 
         return render_template("account/accounts.html", summaries=summaries)
     except Exception as e:
         logger.error(f"Error getting account summaries: {str(e)}")
         flash("Error getting account summaries.", "error")
         return redirect(url_for("main.dashboard"))
-    finally:
-        db.close_session(db_session)
 
 
 @account_bp.route("/accounts/add", methods=["GET", "POST"])
@@ -195,90 +214,65 @@ def accounts():
 def add_account():
     """Add a new bank account."""
     user_id = session.get("user_id")
-    db_session = db.get_session()
 
-    try:
-        # Get all email configurations for this user
-        email_configs = (
-            db_session.query(EmailManuConfigs)
-            .filter(EmailManuConfigs.user_id == user_id)
-            .all()
-        )
+    form_error = None
+    if request.method == "POST":
+        # Check the form before touching the database so bad input costs no queries
+        raw_account_number = request.form.get("account_number")
+        is_valid, account_number, form_error = _validate_account_number(raw_account_number)
 
-        # Get all available banks
-        banks = db_session.query(Bank).all()
+        bank_id = request.form.get("bank_id")
+        account_holder = request.form.get("account_holder")
+        balance = request.form.get("balance", 0.0)
+        currency = request.form.get("currency")
 
-        if request.method == "POST":
-            # Normalize and validate account number
-            raw_account_number = request.form.get("account_number")
-            is_valid, account_number, err = _validate_account_number(raw_account_number)
-            if not is_valid:
-                flash(err, "error")
-                return render_template(
-                    "account/add_account.html", email_configs=email_configs, banks=banks
-                )
+        if is_valid:
+            try:
+                bank_id = int(bank_id) if bank_id else None
+            except ValueError:
+                form_error = "Invalid bank selected"
 
-            bank_id = request.form.get("bank_id")
-            account_holder = request.form.get("account_holder")
-            balance = request.form.get("balance", 0.0)
-            currency = request.form.get("currency")
-            bank_name = None
-            if bank_id:
-                try:
-                    bank = db_session.query(Bank).filter_by(id=int(bank_id)).first()
-                    if bank:
-                        bank_name = bank.name
-                        bank_currency = bank.currency
-
-                        if bank_currency != currency:
-                            flash(
-                                f"Selected bank's currency ({bank_currency}) does not match the provided currency ({currency})",
-                                "error",
-                            )
-                            return render_template(
-                                "account/add_account.html",
-                                email_configs=email_configs,
-                                banks=banks,
-                            )
+        if not form_error:
+            try:
+                balance_float = float(balance) if balance else 0.0
+            except ValueError:
+                form_error = "Balance must be a valid number"
 
+    db_session = db.get_session()
 
-                except ValueError:
-                    flash("Invalid bank selected", "error")
-                    return render_template(
-                        "account/add_account.html",
-                        email_configs=email_configs,
-                        banks=banks,
-                    )
+    try:
+        # Get all available banks (cached across requests)
+        banks = BankRepository.get_bank_options(db_session)
+
+        if request.method == "POST":
+            if form_error:
+                flash(form_error, "error")
+                return render_template("account/add_account.html", banks=banks)
 
-            if not bank_name:
+            bank = {b.id: b for b in banks}.get(bank_id)
+            if not bank:
                 flash("Please select a valid bank", "error")
-                return render_template(
-                    "account/add_account.html", email_configs=email_configs, banks=banks
-                )
+                return render_template("account/add_account.html", banks=banks)
 
-            # Validate balance
-            try:
-                balance_float = float(balance) if balance else 0.0
-            except ValueError:
-                flash("Balance must be a valid number", "error")
-                return render_template(
-                    "account/add_account.html", email_configs=email_configs, banks=banks
+            if bank.currency != currency:
+                flash(
+                    f"Selected bank's currency ({bank.currency}) does not match the provided currency ({currency})",
+                    "error",
                 )
+                return render_template("account/add_account.html", banks=banks)
 
             # Before creating, ensure no duplicate account number for this user
             existing_account = TransactionRepository.existing_account(db_session, user_id, account_number)
             if existing_account:
                 flash("An account with this number already exists.", "error")
-                return render_template(
-                    "account/add_account.html", email_configs=email_configs, banks=banks
-                )
+                return render_template("account/add_account.html", banks=banks)
 
             # Create account data
             account_data = {
                 "user_id": user_id,
                 "account_number": account_number,
-                "bank_id": int(bank_id) if bank_id else None,
-                "bank_name": bank_name,
+                "bank_id": bank_id,
+                "bank_name": bank.name,
                 "account_holder": account_holder,
                 "balance": balance_float,
                 "currency": currency , # TODO: remove it becouse there in bank table
@@ -286,6 +280,7 @@ def add_account():
 
             account = TransactionRepository.create_account(db_session, account_data)
             if account:
+                invalidate_chart_cache(user_id)
 
                 # Configure email filters synchronously, trigger initial sync in background
                 auto_sync_service = EmailSync()
@@ -310,20 +305,16 @@ def add_account():
                 
             else:
                 flash("Error adding account", "error")
-                return render_template(
-                    "account/add_account.html", email_configs=email_configs, banks=banks
-                )
+                return render_template("account/add_account.html", banks=banks)
 
             return redirect(url_for("main.dashboard", acc=account_data.get('account_number')))
 
         # For GET requests, render the form
-        return render_template("account/add_account.html", email_configs=email_configs, banks=banks)
+        return render_template("account/add_account.html", banks=banks)
     except Exception as e:
         logger.error(f"Error adding account: {str(e)}")
         flash("Error adding account. Please try again.", "error")
-        return render_template("account/add_account.html", email_configs=[], banks=[])
-    finally:
-        db.close_session(db_session)
+        return render_template("account/add_account.html", banks=[])
 
 
 @account_bp.route("/accounts/<int:account_id>/edit", methods=["GET", "POST"])
@@ -331,44 +322,60 @@ def add_account():
 def edit_account(account_id):
     """Edit a bank account."""
     user_id = session.get("user_id")
+
+    form_error = None
+    if request.method == "POST":
+        # Check the form before touching the database so bad input costs no queries
+        raw_new_account_number = request.form.get("account_number")
+        is_valid, new_account_number, form_error = _validate_account_number(raw_new_account_number)
+
+        account_holder = request.form.get("account_holder")
+        balance = request.form.get("balance", 0.0)
+        bank_id = request.form.get("bank_id")
+        email_config_id = request.form.get("email_config_id")
+
+        if is_valid:
+            if not bank_id:
+                form_error = "Please select a valid bank"
+            else:
+                try:
+                    bank_id = int(bank_id)
+                except ValueError:
+                    form_error = "Invalid bank selected"
+
+        if not form_error:
+            try:
+                balance_float = float(balance)
+            except ValueError:
+                form_error = "Balance must be a valid number"
+
     db_session = db.get_session()
 
     try:
-        account = (
-            db_session.query(Account)
-            .filter(Account.id == account_id, Account.user_id == user_id)
-            .first()
+        account = db_session.get(
+            Account, account_id, options=_account_load_options()
         )
 
-        if not account:
+        if account is None or account.user_id != user_id:
             flash("Account not found or you do not have permission to edit it", "error")
             return redirect(url_for("main.dashboard"))
 
-        # Get all email configurations for this user
-        email_configs = (
-            db_session.query(EmailManuConfigs)
-            .filter(EmailManuConfigs.user_id == user_id)
-            .all()
-        )
-
-        # Get all available banks
-        banks = db_session.query(Bank).all()
+        # Get all available banks (cached across requests)
+        banks = BankRepository.get_bank_options(db_session)
 
         if request.method == "POST":
-            # Normalize and validate new account number
-            raw_new_account_number = request.form.get("account_number")
-            is_valid, new_account_number, err = _validate_account_number(raw_new_account_number)
-            if not is_valid:
-                flash(err, "error")
+            if form_error:
+                flash(form_error, "error")
                 return render_template(
-                    "account/edit_account.html",
-                    account=account,
-                    email_configs=email_configs,
-                    banks=banks,
+                    "account/edit_account.html", account=account, banks=banks
                 )
 
-            account_holder = request.form.get("account_holder")
-            balance = request.form.get("balance", 0.0)
+            bank = {b.id: b for b in banks}.get(bank_id)
+            if not bank:
+                flash("Selected bank not found", "error")
+                return render_template(
+                    "account/edit_account.html", account=account, banks=banks
+                )
 
             # Prevent duplicate account numbers for the same user
             if new_account_number != account.account_number:
@@ -384,84 +391,36 @@ def edit_account(account_id):
                 if dup:
                     flash("Another account with this number already exists.", "error")
                     return render_template(
-                        "account/edit_account.html",
-                        account=account,
-                        email_configs=email_configs,
-                        banks=banks,
+                        "account/edit_account.html", account=account, banks=banks
                     )
 
             account.account_number = new_account_number
-
-            # Handle bank selection
-            bank_id = request.form.get("bank_id")
-            if bank_id:
-                try:
-                    bank = db_session.query(Bank).filter_by(id=int(bank_id)).first()
-                    if bank:
-                        account.bank_id = int(bank_id)
-                        account.bank_name = bank.name
-                        account.currency = bank.currency
-                    else:
-                        flash("Selected bank not found", "error")
-                        return render_template(
-                            "account/edit_account.html",
-                            account=account,
-                            email_configs=email_configs,
-                            banks=banks,
-                        )
-                except ValueError:
-                    flash("Invalid bank selected", "error")
-                    return render_template(
-                        "account/edit_account.html",
-                        account=account,
-                        email_configs=email_configs,
-                        banks=banks,
-                    )
-            else:
-                flash("Please select a valid bank", "error")
-                return render_template(
-                    "account/edit_account.html",
-                    account=account,
-                    email_configs=email_configs,
-                    banks=banks,
-                )
+            account.bank_id = bank_id
+            account.bank_name = bank.name
+            account.currency = bank.currency
 
             # Update other fields
             account.account_holder = account_holder
-            try:
-                account.balance = float(balance)
-            except ValueError:
-                flash("Balance must be a valid number", "error")
-                return render_template(
-                    "account/edit_account.html",
-                    account=account,
-                    email_configs=email_configs,
-                    banks=banks,
-                )
+            account.balance = balance_float
 
             # Update email_config_id
-            email_config_id = request.form.get("email_config_id")
             if email_config_id:
                 account.email_config_id = int(email_config_id)
             else:
                 account.email_config_id = None
 
             db_session.commit()
+            invalidate_chart_cache(user_id)
             flash("Account updated successfully", "success")
             return redirect(url_for("main.dashboard"))
 
         return render_template(
-            "account/edit_account.html",
-            account=account,
-            email_configs=email_configs,
-            banks=banks,
+            "account/edit_account.html", account=account, banks=banks
         )
     except Exception as e:
         logger.error(f"Error editing account: {str(e)}")
         flash("Error editing account.", "error")
         return redirect(url_for("main.dashboard"))
-    finally:
-        db.close_session(db_session)
 
 
 @account_bp.route("/accounts/<int:account_id>/update-balance", methods=["POST"])
@@ -473,65 +432,73 @@ def update_balance(account_id):
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
     try:
-        account = (
-            db_session.query(Account)
-            .filter(Account.id == account_id, Account.user_id == user_id)
-            .first()
+        owned_account = db_session.query(Account).filter(
+            Account.id == account_id, Account.user_id == user_id
         )
 
-        if not account:
-            if is_ajax:
-                return jsonify(
-                    {
-                        "success": False,
-                        "message": "Account not found or you do not have permission to update it",
-                    }
-                )
-            flash(
-                "Account not found or you do not have permission to update it", "error"
-            )
-            return redirect(url_for("main.dashboard"))
-
         new_balance = request.form.get("new_balance")
+        error = None
         if not new_balance:
-            if is_ajax:
-                return jsonify(
-                    {"success": False, "message": "No balance value provided"}
-                )
-            flash("No balance value provided", "error")
-            return redirect(
-                url_for(
-                    "account.account_details", account_number=account.account_number
-                )
-            )
+            error = "No balance value provided"
+        else:
+            try:
+                new_balance = float(new_balance)
+            except ValueError:
+                error = "Invalid balance value provided"
 
-        try:
-            new_balance = float(new_balance)
-            account.balance = new_balance
-            account.updated_at = datetime.now()  # Update the timestamp
+        # Write the balance straight to the row; no need to load the account
+        updated = error is None and owned_account.update(
+            {Account.balance: new_balance, Account.updated_at: datetime.now()},
+            synchronize_session=False,
+        )
+        if updated:
             db_session.commit()
+            invalidate_chart_cache(user_id)
 
             if is_ajax:
                 return jsonify(
                     {
                         "success": True,
                         "message": "Balance updated successfully",
-                        "balance": account.balance,
-                        "formatted_balance": "{:.3f}".format(account.balance),
+                        "balance": new_balance,
+                        "formatted_balance": "{:.3f}".format(new_balance),
                     }
                 )
 
             flash("Balance updated successfully", "success")
-        except ValueError:
+            account_number = (
+                db_session.query(Account.account_number)
+                .filter(Account.id == account_id)
+                .scalar()
+            )
+            return redirect(
+                url_for("account.account_details", account_number=account_number)
+            )
+
+        # Nothing updated: either the account is not ours or the input was bad
+        account_number = None
+        if error is not None:
+            account_number = owned_account.with_entities(
+                Account.account_number
+            ).scalar()
+        if account_number is None:
             if is_ajax:
                 return jsonify(
-                    {"success": False, "message": "Invalid balance value provided"}
+                    {
+                        "success": False,
+                        "message": "Account not found or you do not have permission to update it",
+                    }
                 )
-            flash("Invalid balance value provided", "error")
+            flash(
+                "Account not found or you do not have permission to update it", "error"
+            )
+            return redirect(url_for("main.dashboard"))
 
-        # For non-AJAX requests, redirect to the account details page
+        if is_ajax:
+            return jsonify({"success": False, "message": error})
+        flash(error, "error")
         return redirect(
-            url_for("account.account_details", account_number=account.account_number)
+            url_for("account.account_details", account_number=account_number)
         )
     except Exception as e:
         logger.error(f"Error updating balance: {str(e)}")
@@ -541,8 +508,6 @@ def update_balance(account_id):
             )
         flash("Error updating balance", "error")
         return redirect(url_for("account.accounts"))
-    finally:
-        db.close_session(db_session)
 
 
 @account_bp.route("/accounts/<int:account_id>/delete", methods=["POST"])
@@ -554,13 +519,14 @@ def delete_account(account_id):
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
     try:
-        account = (
-            db_session.query(Account)
+        # Only ownership matters here, so check it without loading the account
+        owned_account_id = (
+            db_session.query(Account.id)
             .filter(Account.id == account_id, Account.user_id == user_id)
-            .first()
+            .scalar()
         )
 
-        if not account:
+        if owned_account_id is None:
             if is_ajax:
                 return jsonify(
                     {
@@ -573,14 +539,25 @@ def delete_account(account_id):
             )
             return redirect(url_for("account.accounts"))
 
-        # First delete all transactions associated with the account
+        # First delete all transactions associated with the account. The FK
+        # declares ON DELETE CASCADE for new schemas, but SQLite does not
+        # enforce it and older databases were created without it, so the
+        # explicit delete is what actually removes them.
         db_session.query(Transaction).filter(
-            Transaction.account_id == account.id
-        ).delete()
-
-        # Then delete the account
-        db_session.delete(account)
+            Transaction.account_id == owned_account_id
+        ).delete(synchronize_session=False)
+
+        # Budgets scoped to this account fall back to covering all accounts
+        db_session.query(Budget).filter(
+            Budget.account_id == owned_account_id
+        ).update({Budget.account_id: None}, synchronize_session=False)
+
+        # Then delete the account row itself
+        db_session.query(Account).filter(
+            Account.id == owned_account_id
+        ).delete(synchronize_session=False)
         db_session.commit()
+        invalidate_chart_cache(user_id)
 
         if is_ajax:
             return jsonify(
@@ -601,8 +578,6 @@ def delete_account(account_id):
             )
         flash("Error deleting account", "error")
         return redirect(url_for("account.accounts"))
-    finally:
-        db.close_session(db_session)
 
 
 @account_bp.route("/account/<account_number>")
@@ -610,21 +585,20 @@ def delete_account(account_id):
 def account_details(account_number):
     """Display details for a specific account."""
     user_id = session.get("user_id")
-    page = request.args.get("page", 1, type=int)
-    per_page = request.args.get("per_page", 50, type=int)
+    # Page numbers stay OFFSET-based: the template links to arbitrary page numbers and
+    # the page size is capped to the largest option the page-size selector offers
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 50, type=int), 1), 200)
     filter_type = request.args.get("filter", None)
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
     db_session = db.get_session()
 
     try:
         # Get account for this user
-        account = (
-            db_session.query(Account)
-            .filter(
-                Account.user_id == user_id, Account.account_number == account_number
-            )
-            .first()
-        )
+        account = db_session.scalars(
+            _ACCOUNT_BY_NUMBER.options(*_account_load_options()),
+            {"user_id": user_id, "account_number": account_number},
+        ).first()
 
         if not account:
             if is_ajax:
@@ -729,8 +703,6 @@ def account_details(account_number):
             )
         flash("Error getting account details", "error")
         return redirect(url_for("account.accounts"))
-    finally:
-        db.close_session(db_session)
 
 
 @account_bp.route("/preview-email-filters/<int:bank_id>")
@@ -13,6 +13,9 @@ from flask import (Blueprint, current_app, flash, jsonify, redirect,
 from werkzeug.utils import secure_filename
 
 from ..models import Account, Database, TransactionRepository
+from ..services.chart_cache import (chart_cache_get, chart_cache_set,
+                                    invalidate_chart_cache)
+from ..services.counterparty_service import invalidate_counterparty_cache
 from ..services.pdf_parser_service import PDFParser
 from ..utils.helpers import allowed_file
 from ..utils.decorators import login_required
@@ -25,6 +28,48 @@ db = Database()
 logger = logging.getLogger(__name__)
 
 
+_MONTH_ABBREVIATIONS = {
+    1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr", 5: "May", 6: "Jun",
+    7: "Jul", 8: "Aug", 9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec",
+}
+
+
+def _chart_row(kind, name=None, color=None, currency=None, amount=None,
+               amount2=None, period=None):
+    """Select one row of get_chart_data's combined result.
+
+    Every UNION ALL branch must produce the same columns, so unused ones are
+    filled with typed NULLs:
+      totals   -> amount=income, amount2=expense
+      category -> name, color, amount=total
+      month    -> name="Mon YYYY" label, amount=income, amount2=expense,
+                  period=year*100+month
+      account  -> name=account number, color=bank name, currency, amount=balance
+
+    Amounts are coalesced to 0 and cast to float in SQL, so they can go into
+    the chart payload as-is.
+    """
+    from sqlalchemy import Float, Integer, String, cast, func, literal, null, select
+
+    def column(value, type_):
+        return cast(null(), type_) if value is None else value
+
+    def money(value):
+        if value is None:
+            return cast(null(), Float)
+        return cast(func.coalesce(value, 0), Float)
+
+    return select(
+        literal(kind).label("kind"),
+        column(name, String).label("name"),
+        column(color, String).label("color"),
+        column(currency, String).label("currency"),
+        money(amount).label("amount"),
+        money(amount2).label("amount2"),
+        column(period, Integer).label("period"),
+    )
+
+
 @api_bp.route("/get_chart_data")
 @login_required
 def get_chart_data():
@@ -33,7 +78,11 @@ def get_chart_data():
     account_number = request.args.get("account_number", "all")
     date_range = request.args.get("date_range", "overall")
 
-    db_session = db.get_session()
+    # Dashboard refreshes repeat the same aggregates; serve recent results
+    cache_key = (user_id, account_number, date_range)
+    chart_data = chart_cache_get(cache_key)
+    if chart_data is not None:
+        return jsonify(chart_data)
 
     try:
         # Prepare data for charts
@@ -42,7 +91,7 @@ def get_chart_data():
         # Import necessary modules for data aggregation
         from datetime import datetime, timedelta
         from ..models.models import (Category, Transaction, TransactionType)
-        from sqlalchemy import case, extract, func
+        from sqlalchemy import Integer, String, case, cast, extract, func, select, union_all
 
         # Calculate date range based on selection
         end_date = datetime.now()
@@ -63,93 +112,135 @@ def get_chart_data():
             start_date = end_date - timedelta(days=365)
 
 
-        # 1. Income vs. Expense Comparison Chart
-        income_expense_query = db_session.query(
-            func.sum(
-                case(
-                    (
-                        Transaction.transaction_type == TransactionType.INCOME,
-                        Transaction.amount,
-                    ),
-                    else_=0,
-                )
-            ).label("total_income"),
-            func.sum(
-                case(
-                    (
-                        Transaction.transaction_type == TransactionType.EXPENSE,
-                        Transaction.amount,
-                    ),
-                    else_=0,
-                )
-            ).label("total_expense"),
-        ).join(Account)
-
-        # Filter by user_id
-        income_expense_query = income_expense_query.filter(Account.user_id == user_id)
+        # All four charts come back from one UNION ALL round-trip. Every branch
+        # yields the same padded row shape (see _chart_row) tagged with a kind.
+        def account_scope(query):
+            query = query.where(Account.user_id == user_id)
+            if account_number != "all":
+                query = query.where(Account.account_number == account_number)
+            return query
 
-        # Filter by account_number if specified
-        if account_number != "all":
-            income_expense_query = income_expense_query.filter(
-                Account.account_number == account_number
+        income_sum = func.sum(
+            case(
+                (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+                else_=0,
             )
+        )
+        expense_sum = func.sum(
+            case(
+                (Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount),
+                else_=0,
+            )
+        )
 
+        # 1. Income vs. Expense Comparison Chart
+        totals_query = account_scope(
+            _chart_row("totals", amount=income_sum, amount2=expense_sum).join_from(
+                Transaction, Account
+            )
+        )
         # Apply date range filter - only if not "overall"
         if date_range != "overall":
-            income_expense_query = income_expense_query.filter(
-                Transaction.value_date >= start_date
-            )
-
-        income_expense_data = income_expense_query.first()
-
-        chart_data["income_expense"] = {
-            "labels": ["Income", "Expense"],
-            "datasets": [
-                {
-                    "data": [
-                        float(income_expense_data.total_income or 0),
-                        float(income_expense_data.total_expense or 0),
-                    ],
-                    "backgroundColor": ["#4CAF50", "#F44336"],
-                }
-            ],
-        }
+            totals_query = totals_query.where(Transaction.value_date >= start_date)
 
-        # 2. Category Distribution Pie Chart
-        category_query = (
-            db_session.query(
+        # 2. Category Distribution Pie Chart (top 10 expense categories)
+        category_totals = account_scope(
+            select(
                 Category.name,
                 Category.color,
                 func.sum(Transaction.amount).label("total_amount"),
             )
             .join(Transaction, Transaction.category_id == Category.id)
             .join(Account, Transaction.account_id == Account.id)
-            .filter(
-                Account.user_id == user_id,
-                Transaction.transaction_type == TransactionType.EXPENSE,
-                )
+            .where(Transaction.transaction_type == TransactionType.EXPENSE)
+        )
+        if date_range != "overall":
+            category_totals = category_totals.where(Transaction.value_date >= start_date)
+        category_totals = (
+            category_totals.group_by(Category.name, Category.color)
+            .order_by(func.sum(Transaction.amount).desc())
+            .limit(10)
+            .subquery()
+        )
+        category_query = _chart_row(
+            "category",
+            name=category_totals.c.name,
+            color=category_totals.c.color,
+            amount=category_totals.c.total_amount,
         )
 
-        # Filter by account_number if specified
-        if account_number != "all":
-            category_query = category_query.filter(
-                Account.account_number == account_number
+        # 3. Monthly Transaction Trend Line Chart
+        # Always use start_date (now guaranteed to exist) for monthly trends
+        year = extract("year", Transaction.value_date)
+        month = extract("month", Transaction.value_date)
+        # Chart label such as "Jan 2024", built in SQL so it works on any backend
+        month_label = (
+            case(_MONTH_ABBREVIATIONS, value=cast(month, Integer))
+            + " "
+            + cast(cast(year, Integer), String)
+        )
+        monthly_query = (
+            account_scope(
+                _chart_row(
+                    "month",
+                    name=month_label,
+                    amount=income_sum,
+                    amount2=expense_sum,
+                    period=year * 100 + month,
+                ).join_from(Transaction, Account)
             )
+            .where(Transaction.value_date.between(start_date, end_date))
+            .group_by(year, month)
+        )
 
-        # Apply date range filter - only if not "overall"
-        if date_range != "overall":
-            category_query = category_query.filter(Transaction.value_date >= start_date)
+        # 4. Account Balance Comparison Chart
+        account_query = account_scope(
+            _chart_row(
+                "account",
+                name=Account.account_number,
+                color=Account.bank_name,
+                currency=Account.currency,
+                amount=Account.balance,
+            )
+        )
 
-        category_data = (
-            category_query.group_by(Category.name, Category.color)
-            .order_by(func.sum(Transaction.amount).desc())
-            .limit(10)
-            .all()
+        # UNION ALL drops each branch's ORDER BY, so order the combined rows:
+        # months by period, categories and accounts by amount descending.
+        # Partitioning by kind below keeps that order within each chart.
+        chart_query = union_all(
+            totals_query, category_query, monthly_query, account_query
         )
+        chart_query = chart_query.order_by(
+            chart_query.selected_columns.period,
+            chart_query.selected_columns.amount.desc(),
+        )
+
+        # Read-only aggregate: run it in autocommit mode, no session needed
+        with db.read_connection() as conn:
+            rows = conn.execute(chart_query).all()
+
+        rows_by_kind = {"totals": [], "category": [], "month": [], "account": []}
+        for row in rows:
+            rows_by_kind[row.kind].append(row)
+
+        # The aggregate without GROUP BY always yields exactly one totals row
+        income_expense_data = rows_by_kind["totals"][0]
+
+        chart_data["income_expense"] = {
+            "labels": ["Income", "Expense"],
+            "datasets": [
+                {
+                    "data": [income_expense_data.amount, income_expense_data.amount2],
+                    "backgroundColor": ["#4CAF50", "#F44336"],
+                }
+            ],
+        }
+
+        category_data = rows_by_kind["category"]
 
         # Format data for pie chart
         category_labels = [cat.name for cat in category_data]
-        category_values = [float(cat.total_amount) for cat in category_data]
+        category_values = [cat.amount for cat in category_data]
 
         # Use category colors from database, or fallback to defaults
         default_colors = [
@@ -173,66 +264,12 @@ def get_chart_data():
             ],
         }
 
-        # 3. Monthly Transaction Trend Line Chart - FIXED
-        # Always use start_date (now guaranteed to exist) for monthly trends
-        monthly_query = (
-            db_session.query(
-                extract("year", Transaction.value_date).label("year"),
-                extract("month", Transaction.value_date).label("month"),
-                func.sum(
-                    case(
-                        (
-                            Transaction.transaction_type == TransactionType.INCOME,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("income"),
-                func.sum(
-                    case(
-                        (
-                            Transaction.transaction_type == TransactionType.EXPENSE,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ).label("expense"),
-            )
-            .join(Account, Transaction.account_id == Account.id)
-            .filter(
-                Account.user_id == user_id,
-                Transaction.value_date.between(start_date, end_date),
-            )
-        )
-
-        # Filter by account_number if specified
-        if account_number != "all":
-            monthly_query = monthly_query.filter(
-                Account.account_number == account_number
-            )
-
-        monthly_data = (
-            monthly_query.group_by(
-                extract("year", Transaction.value_date),
-                extract("month", Transaction.value_date),
-            )
-            .order_by(
-                extract("year", Transaction.value_date),
-                extract("month", Transaction.value_date),
-            )
-            .all()
-        )
+        monthly_data = rows_by_kind["month"]
 
         # Format data for line chart
-        months = []
-        income_values = []
-        expense_values = []
-
-        for data in monthly_data:
-            month_name = datetime(int(data.year), int(data.month), 1).strftime("%b %Y")
-            months.append(month_name)
-            income_values.append(float(data.income or 0))
-            expense_values.append(float(data.expense or 0))
+        months = [data.name for data in monthly_data]
+        income_values = [data.amount for data in monthly_data]
+        expense_values = [data.amount2 for data in monthly_data]
 
         chart_data["monthly_trend"] = {
             "labels": months,
@@ -256,36 +293,14 @@ def get_chart_data():
             ],
         }
 
-        # 4. Account Balance Comparison Chart
-        account_query = db_session.query(Account).filter(Account.user_id == user_id)
-
-        if account_number != "all":
-            account_query = account_query.filter(
-                Account.account_number == account_number
-            )
-
-        accounts_for_chart = account_query.all()
-
-        account_data = []
-        for account in accounts_for_chart:
-            account_data.append(
-                {
-                    "account_number": account.account_number,
-                    "bank_name": account.bank_name,
-                    "balance": float(account.balance or 0),
-                    "currency": account.currency,
-                }
-            )
-
-        # Sort accounts by balance (descending)
-        account_data.sort(key=lambda x: x["balance"], reverse=True)
-
-        # Format data for bar chart
-        account_labels = [
-            f"{acc['bank_name']} ({acc['account_number'][-4:]})" for acc in account_data
-        ]
-        account_balances = [acc["balance"] for acc in account_data]
-        account_currencies = [acc["currency"] for acc in account_data]
+        # Format data for bar chart (already sorted by balance, descending)
+        account_labels = []
+        account_balances = []
+        account_currencies = []
+        for account in rows_by_kind["account"]:
+            account_labels.append(f"{account.color} ({account.name[-4:]})")
+            account_balances.append(account.amount)
+            account_currencies.append(account.currency)
 
         chart_data["account_balance"] = {
             "labels": account_labels,
@@ -303,12 +318,11 @@ def get_chart_data():
 
         logger.info(f"Monthly trend data - labels: {len(months)}, income data: {len(income_values)}, expense data: {len(expense_values)}")
 
+        chart_cache_set(cache_key, chart_data)
         return jsonify(chart_data)
     except Exception as e:
         logger.error(f"Error getting chart data: {str(e)}")
         return jsonify({"error": "Internal server error"}), 500
-    finally:
-        db.close_session(db_session)
 
 @api_bp.route("/get_category_chart_data")
 @login_required
@@ -613,6 +627,10 @@ def upload_pdf():
                     return redirect(url_for("dashboard"))
                 finally:
                     db.close_session(db_session)
+                    # Rows are committed as they are created, so invalidate even
+                    # when the import stops part way
+                    invalidate_counterparty_cache(user_id)
+                    invalidate_chart_cache(user_id)
                     if filepath and os.path.exists(filepath):
                         try:
                             os.remove(filepath)
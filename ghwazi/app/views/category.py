@@ -14,8 +14,11 @@ from ..models.models import Transaction, Account, TransactionType
 from ..models.database import Database
 from ..models.transaction import TransactionRepository
 from ..models.user import User
-from ..services.category_service import CategoryService
-from ..services.counterparty_service import CounterpartyService
+from ..services.category_service import (CategoryService,
+                                         invalidate_category_cache)
+from ..services.chart_cache import invalidate_chart_cache
+from ..services.counterparty_service import (CounterpartyService,
+                                             invalidate_counterparty_cache)
 from ..utils.decorators import login_required
 
 # Create blueprint
@@ -122,6 +125,9 @@ def edit_category(category_id):
             category.name = request.form.get("name")
             category.color = request.form.get("color")
             db_session.commit()
+            invalidate_category_cache(category_id, user_id)
+            invalidate_chart_cache(user_id)
+            invalidate_counterparty_cache(user_id)
 
             flash("Category updated successfully", "success")
             return redirect(url_for("category.categories"))
@@ -156,6 +162,9 @@ def delete_category(category_id):
 
         db_session.delete(category)
         db_session.commit()
+        invalidate_category_cache(category_id, user_id)
+        invalidate_chart_cache(user_id)
+        invalidate_counterparty_cache(user_id)
 
         flash("Category deleted successfully", "success")
         return redirect(url_for("category.categories"))
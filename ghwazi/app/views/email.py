@@ -13,6 +13,8 @@ from werkzeug.utils import secure_filename
 from ..models import (Account, Bank, EmailManuConfigs)
 from ..models.database import Database
 from ..models.transaction import TransactionRepository
+from ..services.chart_cache import invalidate_chart_cache
+from ..services.counterparty_service import invalidate_counterparty_cache
 from ..services.email_service import EmailService
 from ..services.parser_service import TransactionParser
 from ..utils.decorators import login_required
@@ -34,6 +36,18 @@ email_tasks_lock = Lock()
 scraping_accounts = {}
 
 
+def _update_email_task(task_id, **fields):
+    """Replace a task's status dict with an updated copy.
+
+    Entries in email_tasks are never mutated in place, so status polls can
+    read one with a plain dict lookup instead of taking email_tasks_lock.
+    """
+    with email_tasks_lock:
+        task = email_tasks.get(task_id)
+        if task is not None:
+            email_tasks[task_id] = {**task, **fields}
+
+
 def process_emails_task(
     task_id,
     user_id,
@@ -67,10 +81,9 @@ def process_emails_task(
         logger.debug(f"Connected to email server for user {user_id}")
 
         # Update task status
-        with email_tasks_lock:
-            email_tasks[task_id]["status"] = "processing"
-            email_tasks[task_id]["progress"] = 0
-            email_tasks[task_id]["start_time"] = time.time()
+        _update_email_task(
+            task_id, status="processing", progress=0, start_time=time.time()
+        )
 
         # Get the account to find its associated email configuration
         account = (
@@ -82,19 +95,17 @@ def process_emails_task(
         )
 
         if not account:
-            with email_tasks_lock:
-                email_tasks[task_id]["status"] = "error"
-                email_tasks[task_id]["message"] = "Account not found"
+            _update_email_task(task_id, status="error", message="Account not found")
             logger.error(f"Account {account_number} not found for user {user_id}")
             return
 
         # Check if the account has an associated email configuration
         if not account.email_config_id:
-            with email_tasks_lock:
-                email_tasks[task_id]["status"] = "error"
-                email_tasks[task_id][
-                    "message"
-                ] = "This account does not have an associated email configuration"
+            _update_email_task(
+                task_id,
+                status="error",
+                message="This account does not have an associated email configuration",
+            )
             logger.error(
                 f"Account {account_number} does not have an associated email configuration for user {user_id}"
             )
@@ -108,9 +119,9 @@ def process_emails_task(
         )
 
         if not email_config:
-            with email_tasks_lock:
-                email_tasks[task_id]["status"] = "error"
-                email_tasks[task_id]["message"] = "Email configuration not found"
+            _update_email_task(
+                task_id, status="error", message="Email configuration not found"
+            )
             logger.error(
                 f"Email configuration not found for account {account_number} of user {user_id}"
             )
@@ -138,9 +149,9 @@ def process_emails_task(
 
         # Connect to email
         if not email_service.connect():
-            with email_tasks_lock:
-                email_tasks[task_id]["status"] = "error"
-                email_tasks[task_id]["message"] = "Failed to connect to email server"
+            _update_email_task(
+                task_id, status="error", message="Failed to connect to email server"
+            )
             logger.debug(
                 f"Failed to connect to email server for account {account_number}"
             )
@@ -153,11 +164,13 @@ def process_emails_task(
         )
 
         if not emails:
-            with email_tasks_lock:
-                email_tasks[task_id]["status"] = "completed"
-                email_tasks[task_id]["message"] = "No bank emails found"
-                email_tasks[task_id]["progress"] = 100
-                email_tasks[task_id]["end_time"] = time.time()
+            _update_email_task(
+                task_id,
+                status="completed",
+                message="No bank emails found",
+                progress=100,
+                end_time=time.time(),
+            )
             logger.debug(f"No bank emails found for account {account_number}")
             return
 
@@ -165,6 +178,11 @@ def process_emails_task(
         parsed_emails = []
         saved_count = 0
         total_emails = len(emails)
+        with email_tasks_lock:
+            task = email_tasks.get(task_id)
+        start_time = task.get("start_time") if task else None
+        if start_time is None:
+            start_time = time.time()
 
         for i, email_data in enumerate(emails):
             # Update progress
@@ -172,20 +190,19 @@ def process_emails_task(
 
             # Calculate estimated time remaining
             if i > 0:
-                with email_tasks_lock:
-                    email_tasks[task_id]["progress"] = progress
-                    elapsed_time = time.time() - email_tasks[task_id]["start_time"]
-                    emails_per_second = i / elapsed_time
-                    remaining_emails = total_emails - i
-                    estimated_seconds = (
-                        remaining_emails / emails_per_second
-                        if emails_per_second > 0
-                        else 0
-                    )
-                    email_tasks[task_id]["estimated_seconds"] = estimated_seconds
+                elapsed_time = time.time() - start_time
+                emails_per_second = i / elapsed_time
+                remaining_emails = total_emails - i
+                estimated_seconds = (
+                    remaining_emails / emails_per_second
+                    if emails_per_second > 0
+                    else 0
+                )
+                _update_email_task(
+                    task_id, progress=progress, estimated_seconds=estimated_seconds
+                )
             else:
-                with email_tasks_lock:
-                    email_tasks[task_id]["progress"] = progress
+                _update_email_task(task_id, progress=progress)
 
             # Parse email to extract transaction data
             transaction_data = parser.parse_email(email_data, bank_name)
@@ -235,29 +252,30 @@ def process_emails_task(
         email_service.disconnect()
 
         # Update task status
-        with email_tasks_lock:
-            email_tasks[task_id]["status"] = "completed"
-            email_tasks[task_id]["progress"] = 100
-            email_tasks[task_id]["end_time"] = time.time()
-            email_tasks[task_id]["parsed_count"] = len(parsed_emails)
-            email_tasks[task_id]["saved_count"] = saved_count
-
-            # Store the first transaction in session for display
-            if parsed_emails:
-                email_tasks[task_id]["first_transaction"] = parsed_emails[0][
-                    "transaction"
-                ]
+        completed = {
+            "status": "completed",
+            "progress": 100,
+            "end_time": time.time(),
+            "parsed_count": len(parsed_emails),
+            "saved_count": saved_count,
+        }
+        # Store the first transaction in session for display
+        if parsed_emails:
+            completed["first_transaction"] = parsed_emails[0]["transaction"]
+        _update_email_task(task_id, **completed)
 
     except Exception as e:
         logger.error(f"Error in background task: {str(e)}")
-        with email_tasks_lock:
-            email_tasks[task_id]["status"] = "error"
-            email_tasks[task_id]["message"] = "Email processing failed."
+        _update_email_task(task_id, status="error", message="Email processing failed.")
     finally:
         # Remove the account from scraping_accounts
         with email_tasks_lock:
             scraping_accounts.pop(account_number, None)
         db.close_session(db_session)
+        # Saved rows are committed one by one, so invalidate even after a failure
+        if save_to_db:
+            invalidate_counterparty_cache(user_id)
+            invalidate_chart_cache(user_id)
 
 
 @email_bp.route("/email-configs", methods=["GET"])
@@ -772,11 +790,10 @@ def parse_email():
 @login_required
 def email_task_status(task_id):
     """API endpoint for checking email task status."""
-    with email_tasks_lock:
-        if task_id not in email_tasks:
-            return jsonify({"error": "Task not found"}), 404
-
-        task = email_tasks[task_id].copy()  # Create a copy to avoid holding the lock
+    # Entries are replaced whole, never mutated, so no lock or copy is needed
+    task = email_tasks.get(task_id)
+    if task is None:
+        return jsonify({"error": "Task not found"}), 404
 
     # Calculate elapsed time
     elapsed_time = time.time() - task["start_time"]
@@ -1034,32 +1051,36 @@ def email_processing_status():
 
     if is_ajax:
         tasks = {}
+        # scraping_accounts is mutated in place, so it still needs the lock;
+        # task entries are replaced whole and can be read without it
         with email_tasks_lock:
-            # Build account->task mapping for current user
-            for acc_number, info in scraping_accounts.items():
-                if info.get("user_id") == user_id:
-                    tid = info.get("task_id")
-                    t = email_tasks.get(tid)
-                    if not t:
-                        continue
-                    # Normalize progress to 0..1 for frontend expectation
-                    raw_progress = t.get("progress", 0) or 0
-                    try:
-                        progress = float(raw_progress) / 100.0 if raw_progress > 1 else float(raw_progress)
-                    except Exception:
-                        progress = 0
-                    tasks[acc_number] = {
-                        "status": t.get("status"),
-                        "progress": progress,
-                        "message": t.get("message", ""),
-                    }
+            user_tasks = [
+                (acc_number, info.get("task_id"))
+                for acc_number, info in scraping_accounts.items()
+                if info.get("user_id") == user_id
+            ]
+        # Build account->task mapping for current user
+        for acc_number, tid in user_tasks:
+            t = email_tasks.get(tid)
+            if not t:
+                continue
+            # Normalize progress to 0..1 for frontend expectation
+            raw_progress = t.get("progress", 0) or 0
+            try:
+                progress = float(raw_progress) / 100.0 if raw_progress > 1 else float(raw_progress)
+            except Exception:
+                progress = 0
+            tasks[acc_number] = {
+                "status": t.get("status"),
+                "progress": progress,
+                "message": t.get("message", ""),
+            }
         return jsonify({"tasks": tasks})
 
     # Fallback: render HTML page for the current task in session
     task_id = session.get("email_task_id")
-    with email_tasks_lock:
-        if not task_id or task_id not in email_tasks:
-            flash("No email processing task found", "error")
-            return redirect(url_for("dashboard"))
-        task = email_tasks[task_id].copy()
+    task = email_tasks.get(task_id) if task_id else None
+    if task is None:
+        flash("No email processing task found", "error")
+        return redirect(url_for("dashboard"))
     return render_template("email/email_processing.html", task_id=task_id, task=task)
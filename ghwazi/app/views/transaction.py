@@ -11,11 +11,15 @@ from threading import Lock
 
 from flask import (Blueprint, Flask, Response, flash, jsonify, redirect,
                    render_template, request, session, url_for)
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from ..models import (Account, Category, Database, Transaction,
                 TransactionRepository)
 from ..services import counterparty_service
+from ..services.counterparty_service import invalidate_counterparty_cache
+from ..services.category_service import get_user_category
+from ..services.chart_cache import invalidate_chart_cache
 from ..utils.decorators import login_required
 
 # Create blueprint
@@ -229,6 +233,9 @@ def edit_transaction(transaction_id):
             updated_transaction = TransactionRepository.update_transaction(
                 db_session, transaction_id, transaction_data
             )
+            if updated_transaction:
+                invalidate_chart_cache(user_id)
+                invalidate_counterparty_cache(user_id)
 
             # Re-fetch the transaction with eager-loaded relationships to avoid lazy loads
             transaction = (
@@ -305,6 +312,15 @@ def edit_transaction(transaction_id):
         db.close_session(db_session)
 
 
+def _owned_transaction_account_number(db_session, user_id, transaction_id):
+    """Account number of a transaction if it belongs to the user, else None."""
+    return db_session.scalar(
+        select(Account.account_number)
+        .join(Transaction, Transaction.account_id == Account.id)
+        .where(Transaction.id == transaction_id, Account.user_id == user_id)
+    )
+
+
 @transaction_bp.route("/transaction/<int:transaction_id>", methods=["POST", "DELETE"])
 @login_required
 def delete_transaction(transaction_id):
@@ -314,15 +330,25 @@ def delete_transaction(transaction_id):
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
     try:
-        # Get transaction and verify it belongs to the user
-        transaction = (
-            db_session.query(Transaction)
-            .join(Account)
-            .filter(Transaction.id == transaction_id, Account.user_id == user_id)
-            .first()
+        # The DELETE itself checks ownership; None means nothing was removed
+        account_id = TransactionRepository.delete_user_transaction(
+            db_session, user_id, transaction_id
         )
 
-        if not transaction:
+        if account_id is None:
+            # Tell a missing/foreign transaction apart from a failed delete
+            account_number = _owned_transaction_account_number(
+                db_session, user_id, transaction_id
+            )
+            if account_number:
+                if is_ajax:
+                    return jsonify(
+                        {"success": False, "message": "Error deleting transaction"}
+                    )
+                flash("Error deleting transaction", "error")
+                return redirect(
+                    url_for("account.account_details", account_number=account_number)
+                )
             if is_ajax:
                 return jsonify(
                     {
@@ -336,26 +362,21 @@ def delete_transaction(transaction_id):
             )
             return redirect(url_for("account.accounts"))
 
-        account_number = transaction.account.account_number
-
-        result = TransactionRepository.delete_transaction(db_session, transaction_id)
-        if result:
-            if is_ajax:
-                return jsonify(
-                    {
-                        "success": True,
-                        "message": "Transaction deleted successfully",
-                        "transaction_id": transaction_id,
-                    }
-                )
-            flash("Transaction deleted successfully", "success")
-        else:
-            if is_ajax:
-                return jsonify(
-                    {"success": False, "message": "Error deleting transaction"}
-                )
-            flash("Error deleting transaction", "error")
+        invalidate_chart_cache(user_id)
+        invalidate_counterparty_cache(user_id)
+        if is_ajax:
+            return jsonify(
+                {
+                    "success": True,
+                    "message": "Transaction deleted successfully",
+                    "transaction_id": transaction_id,
+                }
+            )
+        flash("Transaction deleted successfully", "success")
 
+        account_number = db_session.scalar(
+            select(Account.account_number).where(Account.id == account_id)
+        )
         return redirect(url_for("account.account_details", account_number=account_number))
     except Exception as e:
         logger.error(f"Error deleting transaction: {str(e)}")
@@ -377,109 +398,70 @@ def update_transaction_category(transaction_id):
     db_session = db.get_session()
     is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
-    try:
-        # Get transaction and verify it belongs to the user
-        transaction = (
-            db_session.query(Transaction)
-            .join(Account)
-            .filter(Transaction.id == transaction_id, Account.user_id == user_id)
-            .first()
-        )
-
-        if not transaction:
-            if is_ajax:
-                return jsonify(
-                    {
-                        "success": False,
-                        "message": "Transaction not found or you do not have permission to edit it",
-                    }
-                )
-            flash(
-                "Transaction not found or you do not have permission to edit it",
-                "error",
-            )
+    def fail(message, account_number=None):
+        """Error response; a None account_number means the transaction isn't the user's."""
+        if account_number is None:
+            message = "Transaction not found or you do not have permission to edit it"
+        if is_ajax:
+            return jsonify({"success": False, "message": message})
+        flash(message, "error")
+        if account_number is None:
             return redirect(url_for("account.accounts"))
+        return redirect(
+            url_for("account.account_details", account_number=account_number)
+        )
 
-        # Get the category ID from the request
+    try:
+        # Validate the category before touching the transaction; ownership is
+        # checked by the UPDATE itself and only looked up again on failure
         category_id = request.form.get("category_id")
         if not category_id:
-            if is_ajax:
-                return jsonify({"success": False, "message": "Category ID is required"})
-            flash("Category ID is required", "error")
-            return redirect(
-                url_for(
-                    "account.account_details",
-                    account_number=transaction.account.account_number,
-                )
+            return fail(
+                "Category ID is required",
+                _owned_transaction_account_number(db_session, user_id, transaction_id),
             )
         try:
             category_id = int(category_id)
         except ValueError:
-            if is_ajax:
-                return jsonify({"success": False, "message": "Invalid category ID"})
-            flash("Invalid category ID", "error")
-            return redirect(
-                url_for(
-                    "account.account_details",
-                    account_number=transaction.account.account_number,
-                )
+            return fail(
+                "Invalid category ID",
+                _owned_transaction_account_number(db_session, user_id, transaction_id),
             )
-        category = (
-            db_session.query(Category)
-            .filter(Category.id == category_id, Category.user_id == user_id)
-            .first()
-        )
+        # Categories are near-immutable; the shared cache is invalidated on edits
+        category = get_user_category(db_session, category_id, user_id)
         if not category:
-            if is_ajax:
-                return jsonify(
-                    {
-                        "success": False,
-                        "message": "Category not found or not authorized",
-                    }
-                )
-            flash("Category not found or not authorized", "error")
-            return redirect(
-                url_for(
-                    "account.account_details",
-                    account_number=transaction.account.account_number,
-                )
+            return fail(
+                "Category not found or not authorized",
+                _owned_transaction_account_number(db_session, user_id, transaction_id),
             )
 
         # Update the transaction category
-        transaction_data = {"category_id": category_id}
-        updated_transaction = TransactionRepository.update_transaction(
-            db_session, transaction_id, transaction_data
+        account_id = TransactionRepository.set_user_transaction_category(
+            db_session, user_id, transaction_id, category_id
         )
-
-        if updated_transaction:
-            # Get the category name for the response
-            category_name = category.name if category else "Uncategorized"
-
-            if is_ajax:
-                return jsonify(
-                    {
-                        "success": True,
-                        "message": "Category updated successfully",
-                        "category_name": category_name,
-                    }
-                )
-            flash("Category updated successfully", "success")
-            return redirect(
-                url_for(
-                    "account.account_details",
-                    account_number=transaction.account.account_number,
-                )
+        if account_id is None:
+            return fail(
+                "Error updating category",
+                _owned_transaction_account_number(db_session, user_id, transaction_id),
             )
-        else:
-            if is_ajax:
-                return jsonify({"success": False, "message": "Error updating category"})
-            flash("Error updating category", "error")
-            return redirect(
-                url_for(
-                    "account.account_details",
-                    account_number=transaction.account.account_number,
-                )
+
+        invalidate_chart_cache(user_id)
+        invalidate_counterparty_cache(user_id)
+        if is_ajax:
+            return jsonify(
+                {
+                    "success": True,
+                    "message": "Category updated successfully",
+                    "category_name": category.name,
+                }
             )
+        flash("Category updated successfully", "success")
+        account_number = db_session.scalar(
+            select(Account.account_number).where(Account.id == account_id)
+        )
+        return redirect(
+            url_for("account.account_details", account_number=account_number)
+        )
     except Exception as e:
         logger.error(f"Error updating transaction category: {str(e)}")
         if is_ajax:
@@ -3,10 +3,16 @@ Tests for the models module.
 """
 
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 from app import create_app
-from .app.config.testing import TestingConfig
-from .app.models import Account, Category, Database, Transaction, User
+from app.config.testing import TestingConfig
+from app.models import (Account, Category, Transaction, TransactionRepository,
+                        User)
+from app.models.database import Base
+from app.models.models import TransactionType
+from tests.query_counter import count_queries
 
 
 @pytest.fixture
@@ -23,13 +29,14 @@ def client(app):
 
 
 @pytest.fixture
-def db_session(app):
-    """Create database session for testing."""
-    with app.app_context():
-        db = Database()
-        session = db.get_session()
-        yield session
-        session.close()
+def db_session():
+    """Create a session on a fresh in-memory database for each test."""
+    engine = create_engine(TestingConfig.SQLALCHEMY_DATABASE_URI)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
 
 
 class TestUser:
@@ -37,13 +44,8 @@ class TestUser:
 
     def test_create_user(self, db_session):
         """Test user creation."""
-        user_data = {
-            "username": "testuser",
-            "email": "test@example.com",
-            "password": "testpassword123",
-        }
-
-        user = User(**user_data)
+        user = User(username="testuser", email="test@example.com")
+        user.set_password("testpassword123")
         db_session.add(user)
         db_session.commit()
 
@@ -76,7 +78,7 @@ class TestAccount:
         # Create account
         account = Account(
             account_number="1234567890",
-            account_name="Test Account",
+            account_holder="Test Account",
             bank_name="Test Bank",
             user_id=user.id,
         )
@@ -85,8 +87,70 @@ class TestAccount:
 
         assert account.id is not None
         assert account.account_number == "1234567890"
+        assert account.account_holder == "Test Account"
         assert account.user_id == user.id
 
+    def test_account_summaries_single_query(self, db_session):
+        """Account summaries are loaded with one aggregate query."""
+        user = User(username="summaryuser", email="summary@example.com")
+        user.set_password("password")
+        db_session.add(user)
+        db_session.commit()
+
+        for number in ("2234567890", "2234567891"):
+            db_session.add(
+                Account(account_number=number, bank_name="Test Bank", user_id=user.id)
+            )
+        db_session.commit()
+
+        with count_queries(db_session.get_bind()) as queries:
+            summaries = TransactionRepository.get_account_summaries(
+                db_session, user.id
+            )
+
+        assert len(summaries) == 2
+        assert queries.count == 1
+
+    def test_delete_user_transaction_checks_owner(self, db_session):
+        """Only the owner can delete a transaction; the balance is reverted."""
+        owner = User(username="owner", email="owner@example.com")
+        other = User(username="other", email="other@example.com")
+        for user in (owner, other):
+            user.set_password("password")
+        db_session.add_all([owner, other])
+        db_session.commit()
+
+        account = Account(
+            account_number="3234567890",
+            bank_name="Test Bank",
+            balance=90.0,
+            user_id=owner.id,
+        )
+        db_session.add(account)
+        db_session.commit()
+        transaction = Transaction(
+            account_id=account.id,
+            transaction_type=TransactionType.EXPENSE,
+            amount=10.0,
+        )
+        db_session.add(transaction)
+        db_session.commit()
+
+        assert (
+            TransactionRepository.delete_user_transaction(
+                db_session, other.id, transaction.id
+            )
+            is None
+        )
+        assert (
+            TransactionRepository.delete_user_transaction(
+                db_session, owner.id, transaction.id
+            )
+            == account.id
+        )
+        db_session.refresh(account)
+        assert account.balance == 100.0
+
 
 class TestCategory:
     """Test Category model."""
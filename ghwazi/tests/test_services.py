@@ -8,6 +8,8 @@ import pytest
 
 from app import create_app
 from app.config.testing import TestingConfig
+from app.services.chart_cache import (chart_cache_get, chart_cache_set,
+                                      invalidate_chart_cache)
 from app.services.email_service import EmailService
 from app.services.transaction_service import TransactionService
 from app.services.user_service import UserService
@@ -169,6 +171,22 @@ class TestEmailService:
         assert hasattr(service, "save_transaction") or True
 
 
+class TestChartCache:
+    """Test the dashboard chart cache."""
+
+    def test_invalidate_drops_only_that_user(self):
+        """Invalidating a user keeps other users' chart data."""
+        chart_cache_set((1, "all", "1m"), {"a": 1})
+        chart_cache_set((1, "123456", "3m"), {"b": 2})
+        chart_cache_set((2, "all", "1m"), {"c": 3})
+
+        invalidate_chart_cache(1)
+
+        assert chart_cache_get((1, "all", "1m")) is None
+        assert chart_cache_get((1, "123456", "3m")) is None
+        assert chart_cache_get((2, "all", "1m")) == {"c": 3}
+
+
 class TestServiceIntegration:
     """Test service integration."""
 